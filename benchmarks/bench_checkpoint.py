@@ -0,0 +1,38 @@
+"""Checkpoint size and save/load/resume times for a large sparse network.
+
+Compares eager loading with memory-mapped weights. Run from the repository
+root: ``python -m benchmarks.bench_checkpoint``.
+"""
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.network import NeuralNetwork
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main(num_neurons=100000, fan_in=100):
+    path = tempfile.mkdtemp()
+    try:
+        network = NeuralNetwork(num_neurons, 5, backend="numpy", connectivity="sparse", fan_in=fan_in)
+        _, save = timed(lambda: save_checkpoint(network, path))
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+        print(f"{num_neurons} neurons, fan-in {fan_in}: {size / 2**20:.0f} MiB, save {save:.2f} s")
+        inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+        for mmap_mode in (None, "c"):
+            restored, load = timed(lambda: load_checkpoint(path, mmap_mode=mmap_mode))
+            _, first_step = timed(lambda: restored.forward(inputs))
+            print(f"mmap_mode={mmap_mode!s:>4}: load {load * 1e3:8.1f} ms, first step {first_step * 1e3:8.1f} ms")
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
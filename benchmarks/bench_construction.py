@@ -0,0 +1,48 @@
+"""NeuralNetwork construction time from 10 to 10^5 neurons.
+
+Dense connectivity is O(N^2) in memory, and object neurons add an N-wide
+weight vector and STDP raster each, so every configuration has its own
+largest size; sparse networks (fixed fan-in) go up to 10^5.
+Run from the repository root: ``python -m benchmarks.bench_construction``.
+"""
+import gc
+import time
+from src.network import NeuralNetwork
+
+TYPES = ("pyramidal", "interneuron", "sensory", "purkinje", "generic")
+
+
+def build_time(repeats, **options):
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        network = NeuralNetwork(**options)
+        best = min(best, time.perf_counter() - start)
+        del network
+    return best
+
+
+def main(sizes=(10, 100, 1_000, 3_000, 10_000, 100_000), fan_in=100):
+    configurations = (
+        ("object dense", 3_000, dict(backend="object")),
+        ("numpy dense + neurons", 3_000, dict(backend="numpy", materialize_neurons=True)),
+        ("numpy dense", 10_000, dict(backend="numpy")),
+        ("numpy sparse", 100_000, dict(backend="numpy", connectivity="sparse")),
+    )
+    print(f"{'configuration':>22} {'neurons':>8} {'build (ms)':>11}")
+    for label, max_size, options in configurations:
+        for num_neurons in sizes:
+            if num_neurons > max_size:
+                continue
+            if options.get("connectivity") == "sparse":
+                options = dict(options, fan_in=min(fan_in, num_neurons - 1))
+            neuron_types = [TYPES[i % len(TYPES)] for i in range(num_neurons)]
+            repeats = 5 if num_neurons <= 1_000 else 1
+            elapsed = build_time(repeats, num_neurons=num_neurons, num_inputs_per_neuron=5,
+                                 neuron_types=neuron_types, **options)
+            print(f"{label:>22} {num_neurons:>8} {elapsed * 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Step time of NeuralNetwork.forward with per-neuron trace diagnostics off and on.
+
+Run from the repository root: ``python -m benchmarks.bench_diagnostics``.
+"""
+import io
+import time
+import numpy as np
+from src.diagnostics import TRACE, disable_diagnostics, enable_diagnostics
+from src.network import NeuralNetwork
+
+
+def time_steps(network, steps):
+    inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+    outputs = np.zeros(network.num_neurons)
+    start = time.perf_counter()
+    for _ in range(steps):
+        outputs = network.forward(inputs, outputs)
+    return (time.perf_counter() - start) / steps
+
+
+def main(sizes=(100, 1000), steps=50):
+    print(f"{'backend':>8} {'neurons':>8} {'quiet (ms)':>11} {'trace (ms)':>11} {'ratio':>6}")
+    for backend in ("object", "numpy"):
+        for num_neurons in sizes:
+            network = NeuralNetwork(num_neurons, 5, backend=backend)
+            quiet = time_steps(network, steps)
+            handler = enable_diagnostics(TRACE, stream=io.StringIO())
+            try:
+                traced = time_steps(network, steps)
+            finally:
+                disable_diagnostics(handler)
+            print(f"{backend:>8} {num_neurons:>8} {quiet * 1e3:>11.3f} {traced * 1e3:>11.3f} {traced / quiet:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
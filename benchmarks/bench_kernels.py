@@ -0,0 +1,42 @@
+"""Step time of the NumPy and Numba population backends.
+
+Times ``NeuronPopulation.advance`` alone (the neuron state machine, with the
+recurrent drive precomputed) and a full sparse ``NeuralNetwork.forward``.
+Run from the repository root: ``python -m benchmarks.bench_kernels``.
+"""
+import time
+import numpy as np
+from src import kernels
+from src.network import NeuralNetwork
+
+TYPES = ("pyramidal", "interneuron", "sensory", "purkinje", "generic")
+
+
+def time_call(function, steps):
+    function()  # Warm-up, includes JIT compilation
+    start = time.perf_counter()
+    for _ in range(steps):
+        function()
+    return (time.perf_counter() - start) / steps
+
+
+def main(sizes=(1000, 10000, 100000), steps=50):
+    if not kernels.HAVE_NUMBA:
+        print("numba is not installed; only the numpy backend is available")
+        return
+    inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+    print(f"{'neurons':>8} {'backend':>8} {'advance (ms)':>13} {'forward (ms)':>13}")
+    for num_neurons in sizes:
+        neuron_types = [TYPES[i % len(TYPES)] for i in range(num_neurons)]
+        for backend in ("numpy", "numba"):
+            network = NeuralNetwork(num_neurons, 5, neuron_types, backend=backend, connectivity="sparse", fan_in=50)
+            population = network.population
+            drive = population.recurrent_drive(np.ones(num_neurons))
+            advance = time_call(lambda: population.advance(inputs, drive), steps)
+            outputs = np.zeros(num_neurons)
+            forward = time_call(lambda: network.forward(inputs, outputs), steps)
+            print(f"{num_neurons:>8} {backend:>8} {advance * 1e3:>13.3f} {forward * 1e3:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Memory per neuron for object neurons and for array-backed networks.
+
+Run from the repository root: ``python -m benchmarks.bench_memory``.
+"""
+import gc
+import tracemalloc
+from src.network import NeuralNetwork
+from src.neuron import GeneralizedNeuron
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del built
+    return current, peak
+
+
+def main(sizes=(1_000, 10_000, 100_000), num_inputs=25, fan_in=100):
+    print(f"{'representation':>34} {'neurons':>8} {'bytes/neuron':>13} {'peak MB':>8}")
+    for num_neurons in sizes:
+        current, peak = measure(lambda: [GeneralizedNeuron(num_inputs, "pyramidal") for _ in range(num_neurons)])
+        label = f"GeneralizedNeuron ({num_inputs} inputs)"
+        print(f"{label:>34} {num_neurons:>8} {current / num_neurons:>13.0f} {peak / 1e6:>8.1f}")
+    for num_neurons in sizes:
+        current, peak = measure(
+            lambda: NeuralNetwork(num_neurons, 5, backend="numpy", connectivity="sparse", fan_in=fan_in)
+        )
+        label = f"sparse numpy network (fan-in {fan_in})"
+        print(f"{label:>34} {num_neurons:>8} {current / num_neurons:>13.0f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
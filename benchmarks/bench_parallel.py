@@ -0,0 +1,41 @@
+"""Strong scaling of ParallelNeuralNetwork: one fixed network, 1 to N worker processes.
+
+Reports the step time of the serial network and of every worker count, with
+speedup and parallel efficiency relative to the serial run. Run from the
+repository root: ``python -m benchmarks.bench_parallel``.
+"""
+import os
+import time
+import numpy as np
+from src.network import NeuralNetwork
+from src.parallel import ParallelNeuralNetwork
+
+TYPES = ("pyramidal", "interneuron", "sensory", "purkinje", "generic")
+
+
+def time_steps(network, steps):
+    inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+    outputs = network.forward(inputs)
+    start = time.perf_counter()
+    for _ in range(steps):
+        outputs = network.forward(inputs, outputs)
+    return (time.perf_counter() - start) / steps
+
+
+def main(num_neurons=100000, fan_in=100, max_workers=None, steps=20):
+    max_workers = max_workers or os.cpu_count()
+    neuron_types = [TYPES[i % len(TYPES)] for i in range(num_neurons)]
+    options = dict(backend="numpy", connectivity="sparse", fan_in=fan_in)
+    serial = time_steps(NeuralNetwork(num_neurons, 5, neuron_types, **options), steps)
+    print(f"{num_neurons} neurons, fan-in {fan_in}, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'step (ms)':>10} {'speedup':>8} {'efficiency':>11}")
+    print(f"{'serial':>8} {serial * 1e3:>10.2f} {1.0:>8.2f} {1.0:>11.2f}")
+    for workers in range(1, max_workers + 1):
+        with ParallelNeuralNetwork(num_neurons, 5, neuron_types, workers=workers, **options) as network:
+            elapsed = time_steps(network, steps)
+        speedup = serial / elapsed
+        print(f"{workers:>8} {elapsed * 1e3:>10.2f} {speedup:>8.2f} {speedup / workers:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
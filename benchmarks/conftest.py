@@ -0,0 +1,18 @@
+"""pytest-benchmark suite for the neuron, network and plasticity hot paths.
+
+Run from the repository root (the plain ``python -m pytest`` run only
+collects ``tests/``)::
+
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+    python -m pytest benchmarks --benchmark-json=benchmark.json
+
+``--benchmark-autosave`` stores the run as a baseline under ``.benchmarks/``
+and ``--benchmark-compare`` fails when a mean regresses past the threshold.
+Peak memory is recorded in each result's ``extra_info``. The standalone
+``bench_*.py`` scripts next to this file print more detailed tables.
+"""
+from importlib.util import find_spec
+
+if find_spec("pytest_benchmark") is None:  # Optional dependency
+    collect_ignore_glob = ["test_*.py"]
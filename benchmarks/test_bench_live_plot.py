@@ -0,0 +1,34 @@
+import tracemalloc
+import numpy as np
+import pytest
+from src.live_plot import LivePlot
+
+pytest.importorskip("matplotlib")  # Optional dependency
+
+
+@pytest.mark.parametrize("steps", [10_000, 100_000])
+def test_headless_live_plot(benchmark, tmp_path, steps):
+    # Time should grow at most linearly in steps and peak memory stay flat.
+    num_neurons = 1000
+    rng = np.random.default_rng(0)
+    potentials = rng.uniform(-75.0, -40.0, (1000, 10))
+    spikes = (rng.random((1000, num_neurons)) < 0.01).astype(float)
+    path = tmp_path / "live.png"
+
+    def render():
+        plot = LivePlot([("Membrane Potentials", "mV", [f"Neuron {i}" for i in range(10)])], num_neurons,
+                        headless=True)
+        for t in range(steps):
+            plot.append([potentials[t % 1000]], spikes[t % 1000])
+            if t % 1000 == 999:
+                plot.redraw()
+        plot.save(path)
+
+    tracemalloc.start()
+    try:
+        render()
+        benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["steps_per_round"] = steps
+    benchmark.pedantic(render, rounds=3, iterations=1)
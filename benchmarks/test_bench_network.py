@@ -0,0 +1,88 @@
+import tracemalloc
+import numpy as np
+import pytest
+from src import kernels
+from src.network import NeuralNetwork
+
+BACKENDS = ["object", "numpy"] + (["numba"] if kernels.HAVE_NUMBA else [])
+INPUTS = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+
+
+def neuron_types(num_neurons):
+    types = ("pyramidal", "interneuron", "sensory", "purkinje", "generic")
+    return [types[i % len(types)] for i in range(num_neurons)]
+
+
+@pytest.mark.parametrize("num_neurons", [10, 100, 1000])
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_forward_dense(benchmark, backend, num_neurons):
+    network = NeuralNetwork(num_neurons, 5, neuron_types(num_neurons), backend=backend)
+    outputs = network.forward(INPUTS)
+    benchmark(network.forward, INPUTS, outputs)
+
+
+@pytest.mark.parametrize("num_neurons", [1000, 10000, 100000])
+@pytest.mark.parametrize("plasticity", [None, "trace"])
+def test_forward_sparse(benchmark, num_neurons, plasticity):
+    network = NeuralNetwork(num_neurons, 5, neuron_types(num_neurons), backend="numpy", connectivity="sparse",
+                            fan_in=100, plasticity=plasticity)
+    outputs = network.forward(INPUTS)
+    benchmark(network.forward, INPUTS, outputs)
+
+
+@pytest.mark.parametrize("options", [
+    dict(num_neurons=1000, backend="object"),
+    dict(num_neurons=1000, backend="numpy"),
+    dict(num_neurons=100000, backend="numpy", connectivity="sparse", fan_in=100),
+], ids=["object-1000", "numpy-1000", "sparse-100000"])
+def test_construction(benchmark, options):
+    def build():
+        return NeuralNetwork(num_inputs_per_neuron=5, neuron_types=neuron_types(options["num_neurons"]), **options)
+
+    tracemalloc.start()
+    try:
+        build()
+        benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark.pedantic(build, rounds=3, iterations=1)
+
+
+
+def kicked_step(network, activity, steps=50):
+    # Step function that pushes a fixed fraction of neurons over threshold before each forward call.
+    network.recurrent_connectivity.column_index()  # Built once, on the first spike otherwise
+    population = network.population
+    rng = np.random.default_rng(0)
+    kicks = [rng.choice(network.num_neurons, int(activity * network.num_neurons), replace=False)
+             for _ in range(steps)]
+    state = {"step": 0, "outputs": np.zeros(network.num_neurons)}
+
+    def step():
+        kicked = kicks[state["step"] % steps]
+        state["step"] += 1
+        population.membrane_potential[kicked] = population.threshold[kicked] + 1.0
+        state["outputs"] = network.forward(INPUTS, state["outputs"])
+
+    return step
+
+
+@pytest.mark.parametrize("activity", [0.001, 0.01, 0.05, 0.2])
+@pytest.mark.parametrize("event_driven", [False, True], ids=["fixed", "event"])
+def test_forward_low_activity(benchmark, event_driven, activity):
+    # Sensory neurons are left out: their threshold rule keeps a window of the full
+    # recurrent drive, which costs O(N) per step in either mode.
+    network = NeuralNetwork(100000, 5, backend="numpy", connectivity="sparse", fan_in=50,
+                            event_driven=event_driven)
+    benchmark(kicked_step(network, activity))
+
+
+@pytest.mark.parametrize("max_delay", [None, 1, 10, 50])
+def test_forward_delays(benchmark, max_delay):
+    # With the spike-delivery queue the step time should stay flat as max_delay grows.
+    num_neurons, fan_in = 100000, 50
+    rng = np.random.default_rng(0)
+    delays = None if max_delay is None else rng.integers(1, max_delay + 1, size=num_neurons * fan_in)
+    network = NeuralNetwork(num_neurons, 5, backend="numpy", connectivity="sparse", fan_in=fan_in,
+                            event_driven=True, delays=delays)
+    benchmark(kicked_step(network, 0.01))
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from src.neuron import STDP_WINDOW_TOLERANCE, GeneralizedNeuron
+
+NEURON_TYPES = ("pyramidal", "interneuron", "sensory", "purkinje", "motor", "generic")
+STEPS = 200
+
+
+@pytest.mark.parametrize("neuron_type", NEURON_TYPES)
+def test_forward(benchmark, neuron_type):
+    np.random.seed(0)
+    neuron = GeneralizedNeuron(25, neuron_type)
+    inputs = np.random.default_rng(0).standard_normal((STEPS, 25)) * 2.0
+
+    def run():
+        for x in inputs:
+            neuron.membrane_potential = 0.0  # Fire whenever not refractory, so STDP runs too
+            neuron.forward(x)
+
+    benchmark.extra_info["steps_per_round"] = STEPS
+    benchmark(run)
+
+
+@pytest.mark.parametrize("pre_spikes", [0, 10, 100, 1000, 4000])
+def test_update_weights(benchmark, pre_spikes):
+    # Cost of the pairwise rule for a full 40-step window with a spike at every postsynaptic step.
+    np.random.seed(0)
+    neuron = GeneralizedNeuron(100, "pyramidal")
+    rng = np.random.default_rng(0)
+    raster = np.zeros((neuron.pre_spikes.capacity, neuron.num_inputs), dtype=bool)
+    raster.flat[rng.choice(raster.size, pre_spikes, replace=False)] = True
+    for row in raster:
+        neuron.pre_spikes.append(row)
+    for _ in range(neuron.post_spikes.capacity):
+        neuron.post_spikes.append(True)
+    neuron.step_count = neuron.post_spikes.capacity
+    weights = neuron.weights.copy()
+
+    def run():
+        neuron.weights[:] = weights
+        neuron.update_weights(None)
+
+    benchmark(run)
+
+
+def full_window_neuron():
+    # 40-step window, 100 inputs, presynaptic spikes at 10% and a spike at every postsynaptic step.
+    np.random.seed(0)
+    neuron = GeneralizedNeuron(100, "pyramidal")
+    rng = np.random.default_rng(0)
+    for _ in range(neuron.pre_spikes.capacity):
+        neuron.pre_spikes.append(rng.random(100) < 0.1)
+    for _ in range(neuron.post_spikes.capacity):
+        neuron.post_spikes.append(True)
+    neuron.step_count = neuron.post_spikes.capacity
+    return neuron
+
+
+def exp_kernel(neuron):
+    # The kernel as computed before the lookup tables, one exp per spike pair, with the table's window edge rule.
+    params = neuron.params
+    pre = neuron.pre_spikes.to_array()
+    post = neuron.post_spikes.to_array()
+    pre_times = neuron._window_times(len(pre))
+    post_times = neuron._window_times(len(post))[post]
+    dt = post_times[:, None] - pre_times[None, :]
+    window = np.abs(dt) <= params.stdp_window * (1 + STDP_WINDOW_TOLERANCE)
+    kernel = np.where((dt > 0) & window, params.stdp_A_plus * np.exp(-dt / params.stdp_window), 0.0)
+    kernel -= np.where((dt < 0) & window, params.stdp_A_minus * np.exp(dt / params.stdp_window), 0.0)
+    return kernel.sum(axis=0) @ pre
+
+
+def table_kernel(neuron):
+    # update_weights without the clipping and weight write.
+    constants = neuron.constants
+    pre = neuron.pre_spikes.to_array()
+    post = neuron.post_spikes.to_array()
+    shift = len(pre) - len(post) + constants.offset
+    correlation = np.correlate(constants.stdp_kernel, post.astype(float), "valid")
+    return correlation[shift - np.arange(len(pre))] @ pre
+
+
+@pytest.mark.parametrize("kernel", [exp_kernel, table_kernel], ids=["exp", "table"])
+def test_stdp_kernel(benchmark, kernel):
+    neuron = full_window_neuron()
+    np.testing.assert_allclose(table_kernel(neuron), exp_kernel(neuron), atol=1e-12)
+    benchmark(kernel, neuron)
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["exp", "cached"])
+def test_adaptation_factor(benchmark, cached):
+    neuron = full_window_neuron()
+    params = neuron.params
+    if cached:
+        benchmark(lambda: neuron.constants.adaptation_factor)
+    else:
+        benchmark(lambda: np.exp(-params.adaptation_decay * neuron.time_step))
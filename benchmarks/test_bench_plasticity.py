@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from src.connectivity import SparseConnectivity
+from src.plasticity import TraceSTDP
+
+
+@pytest.mark.parametrize("spike_fraction", [0.01, 0.1])
+@pytest.mark.parametrize("layout", ["dense", "sparse"])
+def test_trace_stdp_step(benchmark, layout, spike_fraction):
+    num_neurons = 1000 if layout == "dense" else 100000
+    rng = np.random.default_rng(0)
+    if layout == "dense":
+        weights = rng.standard_normal((num_neurons, num_neurons))
+    else:
+        weights = SparseConnectivity.random(num_neurons, num_neurons, fan_in=100, rng=rng, exclude_diagonal=True)
+    stdp = TraceSTDP(weights, min_weight=-1.0, max_weight=1.0)
+    spikes = rng.random((50, num_neurons)) < spike_fraction
+    steps = iter(range(10**9))
+
+    def run():
+        t = next(steps)
+        stdp.step(t * 0.5, spikes[t % 49], spikes[t % 49 + 1])
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("batch_size", [8, 64])
+@pytest.mark.parametrize("layout", ["dense", "sparse"])
+def test_batched_trace_stdp_step(benchmark, layout, batch_size):
+    # One update of every trial of a simulate_batch(plasticity=True) run on a small network.
+    num_neurons = 200
+    rng = np.random.default_rng(0)
+    if layout == "dense":
+        weights = rng.standard_normal((num_neurons, num_neurons))
+    else:
+        weights = SparseConnectivity.random(num_neurons, num_neurons, fan_in=20, rng=rng, exclude_diagonal=True)
+    stdp = TraceSTDP(weights, min_weight=-1.0, max_weight=1.0).batched(batch_size)
+    spikes = rng.random((50, batch_size, num_neurons)) < 0.05
+    steps = iter(range(10**9))
+
+    def run():
+        t = next(steps)
+        stdp.step(t * 0.5, spikes[t % 49], spikes[t % 49 + 1])
+
+    benchmark(run)
@@ -0,0 +1,44 @@
+import asyncio
+import numpy as np
+import pytest
+from src.network import NeuralNetwork
+from src.realtime import SPIN_TIME, FakeSensor, RealtimeRunner
+
+INPUTS = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+
+
+@pytest.fixture(scope="module")
+def network():
+    return NeuralNetwork(10000, 5, backend="numpy", connectivity="sparse", fan_in=50, event_driven=True)
+
+
+def test_runner_overhead(benchmark, network):
+    # Unpaced run from a filled queue: the cost of one tick of the loop on top of network.forward.
+    steps = 1000
+    inputs = INPUTS + np.random.default_rng(0).standard_normal((steps, 5))
+
+    def setup():
+        source = asyncio.Queue()
+        for x in inputs:
+            source.put_nowait(x)
+        source.put_nowait(None)
+        return (RealtimeRunner(network, source, rate=1e9, buffer_size=steps + 1),), {}
+
+    benchmark.extra_info["steps_per_round"] = steps
+    benchmark.pedantic(lambda runner: asyncio.run(runner.run()), setup=setup, rounds=5, iterations=1)
+
+
+@pytest.mark.parametrize("spin_time", [SPIN_TIME, 0.0])
+@pytest.mark.parametrize("rate", [500, 1000, 2000])
+def test_paced_lag(benchmark, network, rate, spin_time):
+    # Half a second of a fake sensor at the target rate; extra_info shows where the network stops keeping up
+    # and how much lag is left once the runner stops spinning.
+    steps = rate // 2
+    inputs = INPUTS + np.random.default_rng(0).standard_normal((steps, 5))
+
+    def run():
+        runner = RealtimeRunner(network, FakeSensor(inputs, rate), rate=rate, spin_time=spin_time)
+        return asyncio.run(runner.run(steps=steps))
+
+    stats = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info.update({key: value for key, value in stats.as_dict().items() if key != "step_times"})
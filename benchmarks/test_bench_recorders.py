@@ -0,0 +1,34 @@
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.recorders import SpikeEventRecorder, SpikeRecorder
+
+RECORDERS = {"dense": SpikeRecorder, "events": SpikeEventRecorder}
+
+
+@pytest.mark.parametrize("activity", [0.001, 0.01, 0.05])
+@pytest.mark.parametrize("recorder", RECORDERS)
+def test_record_spikes(benchmark, recorder, activity):
+    # Synthetic outputs go straight to the recorder, so only the recording cost is measured.
+    num_neurons, steps = 10000, 2000
+    network = SimpleNamespace(num_neurons=num_neurons)
+    rng = np.random.default_rng(0)
+    block = (rng.random((100, num_neurons)) < activity) * rng.choice([-1.0, 1.0], size=(100, num_neurons))
+
+    def record():
+        instance = RECORDERS[recorder]()
+        instance.start(network, steps)
+        for step in range(steps):
+            instance.record(step, block[step % 100], network)
+        instance.finish()
+        return instance.result()
+
+    tracemalloc.start()
+    try:
+        record()
+        benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["steps_per_round"] = steps
+    benchmark.pedantic(record, rounds=3, iterations=1)
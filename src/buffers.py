@@ -0,0 +1,139 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO of equally shaped rows with O(1) append and eviction.
+
+    Rows live in one preallocated array; once full, each append overwrites
+    the oldest row.
+    """
+
+    def __init__(self, capacity, row_shape=(), dtype=float):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.data = np.zeros((capacity,) + tuple(row_shape), dtype=dtype)
+        self.capacity = capacity
+        self.head = 0  # Slot the next row is written to
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, row):
+        self.data[self.head] = row
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def oldest(self):
+        return self.data[(self.head - self.size) % self.capacity]
+
+    def to_array(self):
+        """Rows ordered from oldest to newest (a copy)."""
+        if self.size < self.capacity:
+            return self.data[:self.size].copy()
+        return np.roll(self.data, -self.head, axis=0)
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+    def repeat(self, count):
+        """Copy with every row repeated ``count`` times along a new leading row axis."""
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                axis = 1 if name == "data" else 0
+                setattr(clone, name, np.repeat(np.expand_dims(value, axis), count, axis=axis))
+        return clone
+
+
+class RunningWindow(RingBuffer):
+    """Ring buffer that also tracks the per-column mean and variance of its rows.
+
+    Uses Welford's update while filling and its sliding-window form once
+    full, so reading the variance never touches the stored rows.
+    """
+
+    def __init__(self, capacity, row_shape=(), dtype=float):
+        super().__init__(capacity, row_shape, dtype)
+        self.mean = np.zeros(tuple(row_shape))
+        self.m2 = np.zeros(tuple(row_shape))
+
+    def append(self, row):
+        row = np.asarray(row, dtype=float)
+        if self.size < self.capacity:
+            delta = row - self.mean
+            self.mean += delta / (self.size + 1)
+            self.m2 += delta * (row - self.mean)
+        else:
+            evicted = self.data[self.head].astype(float)
+            previous_mean = self.mean.copy()
+            self.mean += (row - evicted) / self.capacity
+            self.m2 += (row - evicted) * (row - self.mean + evicted - previous_mean)
+        super().append(row)
+
+    def variance(self):
+        """Population variance (``ddof=0``) of each column over the window."""
+        if self.size == 0:
+            return np.zeros_like(self.m2)
+        return np.maximum(self.m2, 0.0) / self.size
+
+    def clear(self):
+        super().clear()
+        self.mean[...] = 0.0
+        self.m2[...] = 0.0
+
+
+class TimeDecimator:
+    """Bounded summary of an unbounded stream of rows, one bucket of steps per output column.
+
+    Rows are folded into the current bucket with ``reduce`` (for example
+    ``np.minimum``, ``np.maximum`` or ``np.add``). When all ``buckets`` are
+    full, neighbouring pairs are merged with the same ``reduce`` and the
+    bucket width doubles, so memory stays at ``buckets`` rows however long
+    the stream runs, and every row still contributes to exactly one bucket.
+    """
+
+    def __init__(self, buckets=1024, row_shape=(), reduce=np.maximum, dtype=float):
+        if buckets < 2 or buckets % 2:
+            raise ValueError("buckets must be an even number of at least 2")
+        self.data = np.zeros((buckets,) + tuple(row_shape), dtype=dtype)
+        self.current = np.zeros(tuple(row_shape), dtype=dtype)
+        self.reduce = reduce
+        self.buckets = buckets
+        self.count = 0  # Completed buckets
+        self.fill = 0  # Rows in the current bucket
+        self.width = 1  # Rows per bucket
+        self.steps = 0
+
+    def __len__(self):
+        return self.count + (self.fill > 0)
+
+    def append(self, row):
+        if self.fill == 0:
+            self.current[...] = row
+        else:
+            self.reduce(self.current, row, out=self.current)
+        self.fill += 1
+        self.steps += 1
+        if self.fill == self.width:
+            self.data[self.count] = self.current
+            self.count += 1
+            self.fill = 0
+            if self.count == self.buckets:
+                half = self.buckets // 2
+                self.data[:half] = self.reduce(self.data[0::2], self.data[1::2])
+                self.count = half
+                self.width *= 2
+
+    def to_array(self):
+        """One row per bucket, the partly filled last bucket included (a copy)."""
+        if self.fill:
+            return np.concatenate([self.data[:self.count], self.current[None]])
+        return self.data[:self.count].copy()
+
+    def bucket_starts(self):
+        """Index of the first step of every bucket returned by ``to_array``."""
+        return np.arange(len(self)) * self.width
@@ -0,0 +1,231 @@
+import json
+import os
+from dataclasses import asdict
+import numpy as np
+from src import kernels
+from src.buffers import RingBuffer, RunningWindow
+from src.connectivity import SparseConnectivity
+from src.delays import SynapticDelays
+from src.network import NeuralNetwork
+from src.neuron import GeneralizedNeuron, NeuronParameters, neuron_parameters
+from src.plasticity import TraceSTDP
+from src.population import NeuronPopulation
+
+FORMAT_VERSION = 1
+MANIFEST = "checkpoint.json"
+
+# Classes whose instances are stored attribute by attribute and rebuilt without calling __init__.
+_CLASSES = {cls.__name__: cls for cls in (NeuralNetwork, NeuronPopulation, SparseConnectivity, TraceSTDP,
+                                          SynapticDelays, RingBuffer, RunningWindow, GeneralizedNeuron)}
+
+
+def save_checkpoint(network, path, rng_state=True):
+    """Write the complete simulation state of ``network`` to the directory ``path``.
+
+    Every array (connectivity, weights, neuron state, spike and input
+    histories, STDP traces) goes to its own ``.npy`` file; the object layout
+    and scalars go to ``checkpoint.json``. Per-neuron arrays of the object
+    backend are stacked into one file per attribute. With ``rng_state`` the
+    state of the global NumPy RNG is stored as well.
+    """
+    if type(network) is not NeuralNetwork:
+        raise TypeError(f"Cannot checkpoint {type(network).__name__}; only NeuralNetwork is supported")
+    os.makedirs(path, exist_ok=True)
+    writer = _Writer(path)
+    manifest = {"format": FORMAT_VERSION, "network": writer.encode(network, "network")}
+    if rng_state:
+        manifest["rng"] = writer.encode(np.random.get_state(), "rng")
+    temporary = os.path.join(path, MANIFEST + ".tmp")
+    with open(temporary, "w") as file:
+        json.dump(manifest, file)
+    os.replace(temporary, os.path.join(path, MANIFEST))
+
+
+def load_checkpoint(path, mmap_mode="c", mmap_threshold=1 << 20, restore_rng=True):
+    """Rebuild the network saved in ``path``.
+
+    Arrays of at least ``mmap_threshold`` bytes are opened with
+    ``np.load(mmap_mode=mmap_mode)`` instead of being read into memory. The
+    default copy-on-write mode keeps the files untouched while plasticity
+    modifies the weights; pass ``mmap_mode=None`` to load everything eagerly.
+    With ``restore_rng`` the global NumPy RNG is reset to the saved state, so
+    a resumed run continues exactly like the uninterrupted one.
+    """
+    with open(os.path.join(path, MANIFEST)) as file:
+        manifest = json.load(file)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format {manifest.get('format')!r}")
+    reader = _Reader(path, mmap_mode, mmap_threshold)
+    network = reader.decode(manifest["network"])
+    if restore_rng and "rng" in manifest:
+        np.random.set_state(reader.decode(manifest["rng"]))
+    return network
+
+
+def _attributes(obj):
+    transient = getattr(type(obj), "transient_fields", ())
+    if hasattr(obj, "__dict__"):
+        return [name for name in vars(obj) if name not in transient]
+    return [name for name in type(obj).__slots__ if hasattr(obj, name) and name not in transient]
+
+
+class _Writer:
+    def __init__(self, path):
+        self.path = path
+        self.seen = {}  # id -> node, so shared objects stay shared after loading
+        self.keep = []  # Keeps encoded objects alive so their ids stay unique
+
+    def save_array(self, array, name):
+        if array.dtype.hasobject:
+            raise TypeError(f"Cannot checkpoint object array {name}")
+        filename = name + ".npy"
+        # Write to a new inode so arrays memory-mapped from an older checkpoint stay valid.
+        temporary = os.path.join(self.path, filename + ".tmp")
+        with open(temporary, "wb") as file:
+            np.save(file, np.asarray(array))
+        os.replace(temporary, os.path.join(self.path, filename))
+        return filename
+
+    def encode(self, value, name):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return {"scalar": value.item(), "dtype": value.dtype.str}
+        if id(value) in self.seen:
+            return self.seen[id(value)]
+        node = self._encode(value, name)
+        if isinstance(value, (np.ndarray, NeuronParameters)) or type(value).__name__ in _CLASSES:
+            self.seen[id(value)] = {"ref": name}
+            self.keep.append(value)
+            node["name"] = name
+        return node
+
+    def _encode(self, value, name):
+        if isinstance(value, np.ndarray):
+            return {"array": self.save_array(value, name)}
+        if isinstance(value, (list, tuple)):
+            if len(value) > 1 and all(type(item).__name__ in _CLASSES and type(item) is type(value[0])
+                                      for item in value):
+                return {"objects": self._encode_column(value, name)}
+            key = "list" if isinstance(value, list) else "tuple"
+            return {key: [self.encode(item, f"{name}.{i}") for i, item in enumerate(value)]}
+        if isinstance(value, dict):
+            return {"dict": {str(key): self.encode(item, f"{name}.{key}") for key, item in value.items()}}
+        if isinstance(value, NeuronParameters):
+            return {"parameters": asdict(value)}
+        if isinstance(value, np.random.Generator):
+            return {"generator": value.bit_generator.state}
+        if value is kernels.neuron_step or value is getattr(kernels.neuron_step, "py_func", None):
+            return {"kernel": "neuron_step"}
+        if type(value).__name__ in _CLASSES and type(value) is _CLASSES[type(value).__name__]:
+            state = {attribute: self.encode(getattr(value, attribute), f"{name}.{attribute}")
+                     for attribute in _attributes(value)}
+            return {"object": type(value).__name__, "state": state}
+        raise TypeError(f"Cannot checkpoint {name} of type {type(value).__name__}")
+
+    def _encode_column(self, objects, name):
+        # Same-class objects are stored column-wise: equally shaped arrays are stacked into one file.
+        column = {}
+        for attribute in _attributes(objects[0]):
+            values = [getattr(obj, attribute, None) for obj in objects]
+            path = f"{name}.{attribute}"
+            first = values[0]
+            if (isinstance(first, np.ndarray) and
+                    all(isinstance(v, np.ndarray) and v.shape == first.shape and v.dtype == first.dtype
+                        and id(v) not in self.seen for v in values)):
+                column[attribute] = {"stacked": self.save_array(np.stack(values), path)}
+            elif all(type(v).__name__ in _CLASSES and id(v) not in self.seen for v in values):
+                column[attribute] = {"groups": self._encode_groups(values, path)}
+            else:
+                column[attribute] = {"list": [self.encode(v, f"{path}.{i}") for i, v in enumerate(values)]}
+        return {"class": type(objects[0]).__name__, "count": len(objects), "state": column}
+
+    def _encode_groups(self, objects, name):
+        # Mixed classes, e.g. RingBuffer and RunningWindow input histories: one column per class.
+        groups = {}
+        for index, obj in enumerate(objects):
+            groups.setdefault(type(obj).__name__, []).append(index)
+        return [{"indices": indices, "objects": self._encode_column([objects[i] for i in indices],
+                                                                    f"{name}.{class_name}")}
+                for class_name, indices in groups.items()]
+
+
+class _Reader:
+    def __init__(self, path, mmap_mode, mmap_threshold):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self.mmap_threshold = mmap_threshold
+        self.named = {}
+
+    def load_array(self, filename):
+        filename = os.path.join(self.path, filename)
+        large = self.mmap_mode is not None and os.path.getsize(filename) >= self.mmap_threshold
+        return np.load(filename, mmap_mode=self.mmap_mode if large else None)
+
+    def decode(self, node):
+        if not isinstance(node, dict):
+            return node
+        if "ref" in node:
+            return self.named[node["ref"]]
+        if "scalar" in node:
+            return np.dtype(node["dtype"]).type(node["scalar"])
+        if "array" in node:
+            value = self.load_array(node["array"])
+        elif "list" in node:
+            value = [self.decode(item) for item in node["list"]]
+        elif "tuple" in node:
+            value = tuple(self.decode(item) for item in node["tuple"])
+        elif "dict" in node:
+            value = {key: self.decode(item) for key, item in node["dict"].items()}
+        elif "parameters" in node:
+            value = NeuronParameters(**node["parameters"])
+        elif "generator" in node:
+            bit_generator = getattr(np.random, node["generator"]["bit_generator"])()
+            bit_generator.state = node["generator"]
+            value = np.random.Generator(bit_generator)
+        elif "kernel" in node:
+            value = getattr(kernels, node["kernel"]) if kernels.HAVE_NUMBA else None
+        elif "objects" in node:
+            value = self.decode_column(node["objects"])
+        elif "object" in node:
+            value = _CLASSES[node["object"]].__new__(_CLASSES[node["object"]])
+            if "name" in node:
+                self.named[node["name"]] = value  # Before the attributes, for cyclic references
+            for attribute, item in node["state"].items():
+                setattr(value, attribute, self.decode(item))
+            _relink(value)
+        else:
+            raise ValueError(f"Unknown checkpoint node {sorted(node)}")
+        if "name" in node:
+            self.named[node["name"]] = value
+        return value
+
+    def decode_column(self, column):
+        cls = _CLASSES[column["class"]]
+        objects = [cls.__new__(cls) for _ in range(column["count"])]
+        for attribute, node in column["state"].items():
+            if "stacked" in node:
+                values = self.load_array(node["stacked"])
+            elif "groups" in node:
+                values = [None] * column["count"]
+                for group in node["groups"]:
+                    for index, value in zip(group["indices"], self.decode_column(group["objects"])):
+                        values[index] = value
+            else:
+                values = [self.decode(item) for item in node["list"]]
+            for obj, value in zip(objects, values):
+                setattr(obj, attribute, value)
+        for obj in objects:
+            _relink(obj)
+        return objects
+
+
+def _relink(obj):
+    # Restore sharing that is cheaper to recompute than to store.
+    if isinstance(obj, GeneralizedNeuron):
+        obj._constants = None
+        shared = neuron_parameters(obj.neuron_type, obj.region)
+        if obj.params == shared:
+            obj.params = shared
+        if obj.stdp is not None:
+            obj.stdp.weights = obj.weights.reshape(1, -1)
@@ -0,0 +1,136 @@
+import numpy as np
+
+
+class SparseConnectivity:
+    """Compressed sparse row matrix holding weights only on existing synapses.
+
+    Row ``i`` lists the presynaptic partners of neuron ``i`` in
+    ``indices[indptr[i]:indptr[i + 1]]`` with matching weights in ``data``.
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=float)
+        self.shape = tuple(shape)
+        if self.indptr.shape != (self.shape[0] + 1,):
+            raise ValueError("indptr must have one entry per row plus one")
+        if self.indices.shape != self.data.shape or self.indptr[-1] != self.data.size:
+            raise ValueError("indices and data must both hold indptr[-1] entries")
+
+    @classmethod
+    def random(cls, num_rows, num_cols, fan_in=None, connection_prob=None, rng=None, exclude_diagonal=False,
+               scale=1.0):
+        if (fan_in is None) == (connection_prob is None):
+            raise ValueError("Specify exactly one of fan_in or connection_prob")
+        rng = np.random.default_rng() if rng is None else rng
+        available = num_cols - 1 if exclude_diagonal else num_cols
+        if fan_in is not None:
+            if fan_in > available:
+                raise ValueError(f"fan_in={fan_in} exceeds the {available} available presynaptic neurons")
+            counts = np.full(num_rows, fan_in, dtype=np.int64)
+        else:
+            counts = rng.binomial(available, connection_prob, size=num_rows)
+        indptr = np.zeros(num_rows + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        rows = np.repeat(np.arange(num_rows, dtype=np.int64), counts)
+        columns = _sample_distinct_columns(rng, rows, available)
+        if exclude_diagonal:
+            columns += columns >= rows
+        data = rng.random(rows.size) * scale
+        return cls(indptr, columns, data, (num_rows, num_cols))
+
+    @classmethod
+    def from_dense(cls, matrix):
+        matrix = np.asarray(matrix, dtype=float)
+        rows, columns = np.nonzero(matrix)
+        indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=matrix.shape[0]), out=indptr[1:])
+        return cls(indptr, columns, matrix[rows, columns], matrix.shape)
+
+    @property
+    def nnz(self):
+        return self.data.size
+
+    def row_ids(self):
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def row_slice(self, start, stop):
+        """Rows ``start:stop`` as a matrix whose ``indices`` and ``data`` are views into this one."""
+        first, last = self.indptr[start], self.indptr[stop]
+        return SparseConnectivity(self.indptr[start:stop + 1] - first, self.indices[first:last],
+                                  self.data[first:last], (stop - start, self.shape[1]))
+
+    def row_norms(self):
+        return np.sqrt(self._row_sums(self.data * self.data))
+
+    def scale_rows(self, factors):
+        self.data *= np.repeat(np.asarray(factors, dtype=float), np.diff(self.indptr))
+
+    def dot(self, vector, data=None):
+        """``self @ vector``, or with ``data`` the same structure holding those weights instead."""
+        vector = np.asarray(vector, dtype=float)
+        data = (self.data if data is None else data).reshape((-1,) + (1,) * (vector.ndim - 1))
+        return self._row_sums(data * vector[self.indices])
+
+    __matmul__ = dot
+
+    def column_index(self):
+        """Column-major view of the synapses, built once and cached.
+
+        Returns ``(order, column_ptr, rows)``: the synapses of column ``j`` are
+        ``order[column_ptr[j]:column_ptr[j + 1]]`` in row order, and ``rows``
+        maps every synapse to its row. Only the structure is indexed, so
+        updating ``data`` in place keeps the cache valid.
+        """
+        if getattr(self, "_column_order", None) is None:
+            self._column_order = np.argsort(self.indices, kind="stable")
+            self._column_ptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=self._column_ptr[1:])
+            self._row_of = self.row_ids()
+        return self._column_order, self._column_ptr, self._row_of
+
+    def dot_active(self, vector, active):
+        """``self @ vector`` for a vector that is zero outside the column indices ``active``.
+
+        Touches only the synapses leaving ``active``, so the cost follows the
+        number of spikes rather than the number of synapses.
+        """
+        order, column_ptr, rows = self.column_index()
+        synapses = order[concat_ranges(column_ptr[active], column_ptr[active + 1])]
+        values = self.data[synapses] * np.asarray(vector, dtype=float)[self.indices[synapses]]
+        return np.bincount(rows[synapses], weights=values, minlength=self.shape[0])
+
+    def toarray(self):
+        dense = np.zeros(self.shape)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
+
+    def _row_sums(self, values):
+        sums = np.zeros((self.shape[0],) + values.shape[1:])
+        if values.size == 0:
+            return sums
+        nonempty = self.indptr[1:] > self.indptr[:-1]
+        sums[nonempty] = np.add.reduceat(values, self.indptr[:-1][nonempty], axis=0)
+        return sums
+
+
+def concat_ranges(starts, ends):
+    """Concatenation of ``arange(start, end)`` for every pair, without a Python loop."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+def _sample_distinct_columns(rng, rows, num_cols):
+    # Draw with replacement, then redraw the duplicates inside each row until
+    # every row holds distinct columns. Sorting the combined row-major key keeps
+    # rows in order and columns ascending within each row.
+    keys = rows * num_cols + rng.integers(0, num_cols, size=rows.size)
+    while True:
+        keys.sort()
+        duplicate = np.flatnonzero(keys[1:] == keys[:-1]) + 1
+        if duplicate.size == 0:
+            return keys - rows * num_cols
+        keys[duplicate] = rows[duplicate] * num_cols + rng.integers(0, num_cols, size=duplicate.size)
@@ -0,0 +1,57 @@
+import numpy as np
+from src.connectivity import SparseConnectivity, concat_ranges
+
+
+class SynapticDelays:
+    """Per-synapse integer transmission delays for a recurrent weight matrix.
+
+    A spike emitted on step ``t`` reaches its target on step ``t + d`` for a
+    synapse of delay ``d >= 1``; a delay of one step is the undelayed network.
+    Pending input currents live in a circular buffer with one row per arrival
+    step. Each spike is scattered into its future rows once, when it is
+    delivered to ``deliver``, so the cost of a step follows the number of
+    spikes rather than synapses times ``max_delay``.
+
+    ``weights`` is a ``(num_post, num_pre)`` array or a ``SparseConnectivity``
+    and is read when a spike is emitted, so plasticity applies to spikes still
+    in flight only from their next emission on. ``delays`` is an integer, an
+    array shaped like ``weights`` for dense weights, or one entry per synapse
+    (aligned with ``weights.data``) for sparse weights.
+    """
+
+    def __init__(self, weights, delays):
+        self.weights = weights
+        shape = (weights.nnz,) if isinstance(weights, SparseConnectivity) else weights.shape
+        self.delays = np.broadcast_to(np.asarray(delays, dtype=np.int64), shape).copy()
+        if self.delays.size and self.delays.min() < 1:
+            raise ValueError("Synaptic delays must be at least one step")
+        self.max_delay = int(self.delays.max()) if self.delays.size else 1
+        self.pending = np.zeros((self.max_delay, weights.shape[0]))
+        self.head = 0  # Row of pending currents arriving on the next step
+
+    def deliver(self, previous_outputs):
+        """Queue the spikes in ``previous_outputs`` and return the input arriving on this step."""
+        active = np.flatnonzero(previous_outputs)
+        if active.size:
+            weights = self.weights
+            if isinstance(weights, SparseConnectivity):
+                order, column_ptr, rows = weights.column_index()
+                synapses = order[concat_ranges(column_ptr[active], column_ptr[active + 1])]
+                rows = rows[synapses]
+                delays = self.delays[synapses]
+                currents = weights.data[synapses] * previous_outputs[weights.indices[synapses]]
+            else:
+                rows = np.repeat(np.arange(weights.shape[0]), active.size)
+                delays = self.delays[:, active].reshape(-1)
+                currents = (weights[:, active] * previous_outputs[active]).reshape(-1)
+            slots = (self.head + delays - 1) % self.max_delay
+            np.add.at(self.pending.reshape(-1), slots * self.pending.shape[1] + rows, currents)
+        arriving = self.pending[self.head].copy()
+        self.pending[self.head] = 0.0
+        self.head = (self.head + 1) % self.max_delay
+        return arriving
+
+    def clear(self):
+        """Drop every spike still in flight."""
+        self.pending[:] = 0.0
+        self.head = 0
@@ -0,0 +1,27 @@
+import logging
+import sys
+
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+logger = logging.getLogger("src")
+logger.addHandler(logging.NullHandler())
+
+
+def enable_diagnostics(level=logging.INFO, stream=None):
+    """Attach a stream handler to the package logger and set its level.
+
+    Pass ``level=TRACE`` for one line per neuron per step; this is slow and
+    meant for small networks only.
+    """
+    handler = logging.StreamHandler(sys.stdout if stream is None else stream)
+    handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+def disable_diagnostics(handler=None):
+    if handler is not None:
+        logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
@@ -0,0 +1,75 @@
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # Optional dependency; the kernel still runs as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+GENERIC, PYRAMIDAL, SENSORY, INTERNEURON = 0, 1, 2, 3
+
+
+def neuron_kinds(neuron_types):
+    neuron_types = np.asarray(neuron_types)
+    kinds = np.full(neuron_types.shape, GENERIC, dtype=np.int8)
+    kinds[neuron_types == "pyramidal"] = PYRAMIDAL
+    kinds[neuron_types == "sensory"] = SENSORY
+    kinds[neuron_types == "interneuron"] = INTERNEURON
+    return kinds
+
+
+@njit(cache=True)
+def neuron_step(kinds, external_connectivity, inputs, recurrent_sum, input_variance, recurrent_variance,
+                num_inputs, adapt_threshold, time_step, membrane_potential, threshold, base_threshold, refractory_time,
+                refractory_period, adaptation_current, adaptation_factor, adaptation_strength, reset_potential,
+                burst_count, max_bursts, is_excitatory, output_scaling, spike, outputs):
+    """Advance every neuron by one step in a single pass.
+
+    State arrays are flat with trials concatenated; parameter arrays hold one
+    entry per neuron. ``inputs`` and ``input_variance`` have one row per
+    trial, ``recurrent_sum`` and ``recurrent_variance`` one entry per trial
+    (the summed recurrent drive and the summed variance of its window).
+    ``num_inputs`` counts external inputs plus the whole recurrent drive
+    vector, which is wider than ``external_connectivity`` has rows when the
+    population is a partition of a larger network.
+    """
+    num_neurons, num_external = external_connectivity.shape
+    for k in range(spike.shape[0]):
+        n = k % num_neurons
+        trial = k // num_neurons
+        kind = kinds[n]
+        if kind == SENSORY and adapt_threshold:
+            variance = recurrent_variance[trial]
+            for j in range(num_external):
+                variance += external_connectivity[n, j] ** 2 * input_variance[trial, j]
+            if variance / num_inputs > 0.5:
+                threshold[k] = max(-70.0, threshold[k] - 2.0)
+            else:
+                threshold[k] = min(threshold[k] + 2.0, base_threshold[n] + 10.0)
+        elif kind == INTERNEURON:
+            total = recurrent_sum[trial]
+            for j in range(num_external):
+                total += external_connectivity[n, j] * inputs[trial, j]
+            is_excitatory[k] = not total / num_inputs > 0.5
+
+        refractory_time[k] = max(refractory_time[k] - time_step, 0.0)
+        adaptation_current[k] *= adaptation_factor[n]
+        if refractory_time[k] <= 0 and membrane_potential[k] >= threshold[k]:
+            spike[k] = 1
+            membrane_potential[k] = reset_potential[n]
+            refractory_time[k] = refractory_period[n]
+            adaptation_current[k] += adaptation_strength[n]
+            if kind == PYRAMIDAL and burst_count[k] < max_bursts[n]:
+                burst_count[k] += 1
+                refractory_time[k] = refractory_period[n] / 2
+            output = output_scaling[n]
+        else:
+            spike[k] = 0
+            burst_count[k] = 0
+            output = 0.0
+        outputs[k] = output if is_excitatory[k] else -output
@@ -0,0 +1,172 @@
+import numpy as np
+from src.buffers import TimeDecimator
+from src.recorders import Recorder
+
+
+def min_max_lines(starts, lows, highs):
+    """Polyline through the min and max of every bucket, one column per series.
+
+    Each bucket becomes a vertical stroke from its minimum to its maximum, so
+    a one-step spike or reset stays visible at any zoom level.
+    """
+    x = np.repeat(starts, 2)
+    y = np.empty((2 * len(lows),) + lows.shape[1:])
+    y[0::2] = lows
+    y[1::2] = highs
+    return x, y
+
+
+class LivePlot:
+    """Figure of streamed traces and a spike raster that is updated in place.
+
+    ``panels`` is a list of ``(title, ylabel, labels)``, one axis per entry
+    with one line per label. Each ``append`` adds one step: a value vector
+    per panel and, with ``num_neurons``, the output vector for the raster.
+    Traces are kept as min/max envelopes and the raster as spike counts of
+    ``raster_rows`` neuron groups, both over at most ``buckets`` time
+    buckets, so memory and redraw time stay bounded for any run length.
+    ``redraw`` moves the data into the existing artists with ``set_data``.
+    A raster pixel is black when any neuron of its group spiked in its
+    bucket; keep ``buckets`` and ``raster_rows`` below the axis size in
+    pixels so that no bucket falls between two pixels.
+
+    With ``headless`` the figure is drawn on an Agg canvas without pyplot,
+    for rendering long runs to files; otherwise it opens in a pyplot window.
+    """
+
+    def __init__(self, panels, num_neurons=None, raster_rows=128, buckets=512, time_step=1.0, headless=False,
+                 figsize=(12, 8)):
+        self.panels = panels
+        self.num_neurons = num_neurons
+        self.time_step = time_step
+        self.headless = headless
+        self.envelopes = [(TimeDecimator(buckets, (len(labels),), np.minimum),
+                           TimeDecimator(buckets, (len(labels),), np.maximum)) for _, _, labels in panels]
+        self.raster = None
+        if num_neurons is not None:
+            self.raster_rows = min(num_neurons, raster_rows)
+            self.raster = TimeDecimator(buckets, (self.raster_rows,), np.add, dtype=np.int64)
+        self._build_figure(figsize)
+
+    def _build_figure(self, figsize):
+        if self.headless:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            self.figure = Figure(figsize=figsize)
+            FigureCanvasAgg(self.figure)
+        else:
+            import matplotlib.pyplot as plt
+            self.figure = plt.figure(figsize=figsize)
+            plt.show(block=False)
+        num_axes = len(self.panels) + (self.raster is not None)
+        axes = self.figure.subplots(num_axes, 1, sharex=True, squeeze=False)[:, 0]
+        self.lines = []
+        for ax, (title, ylabel, labels) in zip(axes, self.panels):
+            self.lines.append([ax.plot([], [], linewidth=0.8, label=label)[0] for label in labels])
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+            ax.grid(True)
+            if 1 < len(labels) <= 10:
+                ax.legend(loc="upper right")
+        self.image = None
+        if self.raster is not None:
+            ax = axes[-1]
+            self.image = ax.imshow(np.zeros((self.raster_rows, 1)), aspect="auto", interpolation="nearest",
+                                   cmap="Greys", vmin=0, vmax=1, extent=(0, 1, self.num_neurons, 0))
+            ax.set_title("Spike Raster")
+            ax.set_ylabel("Neuron Index")
+        axes[-1].set_xlabel("Time (ms)")
+        self.axes = axes
+
+    def append(self, values, spikes=None):
+        for (lows, highs), value in zip(self.envelopes, values):
+            lows.append(value)
+            highs.append(value)
+        if self.raster is not None:
+            active = np.flatnonzero(spikes)
+            self.raster.append(np.bincount(active * self.raster_rows // self.num_neurons, minlength=self.raster_rows))
+
+    def redraw(self):
+        steps = self.envelopes[0][0].steps if self.envelopes else self.raster.steps
+        duration = max(steps, 1) * self.time_step
+        for ax, lines, (lows, highs) in zip(self.axes, self.lines, self.envelopes):
+            if not len(lows):
+                continue
+            x, y = min_max_lines(lows.bucket_starts() * self.time_step, lows.to_array(), highs.to_array())
+            for i, line in enumerate(lines):
+                line.set_data(x, y[:, i])
+            bottom, top = y.min(), y.max()
+            margin = 0.05 * (top - bottom) or 1.0
+            ax.set_ylim(bottom - margin, top + margin)
+        self.axes[0].set_xlim(0, duration)
+        if self.image is not None and len(self.raster):
+            self.image.set_data(self.raster.to_array().T > 0)
+            self.image.set_extent((0, len(self.raster) * self.raster.width * self.time_step, self.num_neurons, 0))
+        if not self.headless:
+            self.figure.canvas.draw_idle()
+            self.figure.canvas.flush_events()
+
+    def save(self, path, **kwargs):
+        self.redraw()
+        self.figure.savefig(path, **kwargs)
+
+
+class LivePlotRecorder(Recorder):
+    """Recorder that streams membrane potentials and spikes into a ``LivePlot``.
+
+    Potentials of ``neurons`` (the first ten by default) are drawn as lines,
+    spikes of the whole network as a raster. The figure is redrawn every
+    ``refresh_every`` sampled steps and, with ``path``, saved when the run
+    ends. ``headless`` defaults to rendering without a window when ``path``
+    is given. No rows are buffered, so memory stays bounded: ``result``
+    returns the ``LivePlot`` and ``sampled_steps`` the first step of every
+    plotted time bucket.
+    """
+
+    def __init__(self, neurons=None, refresh_every=1000, path=None, headless=None, buckets=512, raster_rows=128,
+                 time_step=0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.neurons = neurons
+        self.refresh_every = refresh_every
+        self.path = path
+        self.headless = path is not None if headless is None else headless
+        self.buckets = buckets
+        self.raster_rows = raster_rows
+        self.time_step = time_step
+        self.plot = None
+        self._samples = 0
+
+    def start(self, network, num_steps=None):
+        neurons = range(min(10, network.num_neurons)) if self.neurons is None else self.neurons
+        self._index = np.asarray(neurons)
+        panels = [("Membrane Potentials", "Membrane Potential (mV)", [f"Neuron {i}" for i in neurons])]
+        self.plot = LivePlot(panels, network.num_neurons, self.raster_rows, self.buckets,
+                             self.time_step * self.every, self.headless)
+        self._samples = 0
+
+    def record(self, step, outputs, network):
+        if step % self.every:
+            return
+        self.plot.append([self.sample(outputs, network)], outputs)
+        self._samples += 1
+        if self._samples % self.refresh_every == 0:
+            self.plot.redraw()
+
+    def row_shape(self, network):
+        return self._index.shape
+
+    def sample(self, outputs, network):
+        return network.membrane_potentials()[self._index]
+
+    def finish(self):
+        if self.path is not None:
+            self.plot.save(self.path)
+        else:
+            self.plot.redraw()
+
+    def result(self):
+        return self.plot
+
+    def sampled_steps(self):
+        lows = self.plot.envelopes[0][0]
+        return lows.bucket_starts() * self.every
@@ -1,68 +1,253 @@
+import logging
+from itertools import islice
 import numpy as np
+from src import kernels
+from src.diagnostics import TRACE
 from src.neuron import GeneralizedNeuron
+from src.connectivity import SparseConnectivity
+from src.delays import SynapticDelays
+from src.plasticity import TraceSTDP
+from src.population import NeuronPopulation
+
+logger = logging.getLogger(__name__)
 
 class NeuralNetwork:
-    def __init__(self, num_neurons, num_inputs_per_neuron, neuron_types=None, region="cortex"):
-        np.random.seed(42)  # Fixed seed for consistency
+    backends = ("object", "numpy", "numba")
+
+    def __init__(self, num_neurons, num_inputs_per_neuron, neuron_types=None, region="cortex", backend="object",
+                 connectivity="dense", fan_in=None, connection_prob=None, plasticity=None, rng=None,
+                 materialize_neurons=None, event_driven=False, delays=None):
+        """Build the connectivity, neuron parameters and state in bulk.
+
+        All random draws come from ``rng``, a ``np.random.Generator``; the
+        default is a fresh ``default_rng(42)``, so equal arguments give equal
+        networks and the global NumPy RNG is left alone. Array backends keep
+        their state in a ``NeuronPopulation`` and create no per-neuron objects
+        unless ``materialize_neurons`` is set; the object backend always has them.
+        Without neuron objects, ``get_state`` omits the per-neuron ``weights``
+        and ``bias`` keys, see ``NeuronPopulation.get_state``.
+        ``event_driven`` switches the population to event-driven integration,
+        see ``NeuronPopulation.event_driven``. ``delays`` gives the recurrent
+        synapses integer transmission delays in steps, see ``SynapticDelays``.
+        """
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {self.backends}")
+        if connectivity not in ("dense", "sparse"):
+            raise ValueError(f"Unknown connectivity {connectivity!r}; expected 'dense' or 'sparse'")
+        if connectivity == "sparse" and backend == "object":
+            raise ValueError("Sparse connectivity requires an array backend such as 'numpy'")
+        if connectivity == "sparse" and fan_in is None and connection_prob is None:
+            raise ValueError("Sparse connectivity requires fan_in or connection_prob")
+        if plasticity not in (None, "trace"):
+            raise ValueError(f"Unknown plasticity {plasticity!r}; expected None or 'trace'")
+        if plasticity is not None and backend == "object":
+            raise ValueError("Network-level plasticity requires an array backend such as 'numpy'")
+        if delays is not None and backend == "object":
+            raise ValueError("Synaptic delays require an array backend such as 'numpy'")
+        if event_driven and backend == "object":
+            raise ValueError("Event-driven integration requires an array backend such as 'numpy'")
+        if event_driven and backend == "numba":
+            raise ValueError("Event-driven integration has no compiled kernel; use backend='numpy'")
+        if backend == "numba" and not kernels.HAVE_NUMBA:
+            logger.warning("Numba is not installed; backend='numba' falls back to 'numpy'")
         if neuron_types is None:
             neuron_types = ["pyramidal"] * int(0.8 * num_neurons) + ["interneuron"] * int(0.2 * num_neurons)
         if len(neuron_types) != num_neurons:
             raise ValueError("Number of neuron types must match num_neurons")
+        if rng is None:
+            rng = np.random.default_rng(42)
         self.num_neurons = num_neurons
         self.num_inputs_per_neuron = num_inputs_per_neuron
-        self.neurons = [
-            GeneralizedNeuron(num_inputs_per_neuron + num_neurons, neuron_type, region, time_step=0.5)
-            for neuron_type in neuron_types
+        self.backend = backend
+        self.connectivity = connectivity
+        self.population = None
+        self.neurons = None
+
+        self.external_connectivity = rng.random((num_neurons, num_inputs_per_neuron))
+        self.external_connectivity *= (rng.random((num_neurons, num_inputs_per_neuron)) < 0.85) * 80.0
+        _normalize_rows(self.external_connectivity, 80.0)
+        if connectivity == "sparse":
+            self.recurrent_connectivity = SparseConnectivity.random(
+                num_neurons, num_neurons, fan_in=fan_in, connection_prob=connection_prob, rng=rng,
+                exclude_diagonal=True, scale=80.0,
+            )
+            norms = self.recurrent_connectivity.row_norms()
+            self.recurrent_connectivity.scale_rows(np.divide(80.0, norms, out=np.ones(num_neurons), where=norms > 0))
+        else:
+            self.recurrent_connectivity = rng.random((num_neurons, num_neurons))
+            self.recurrent_connectivity *= (rng.random((num_neurons, num_neurons)) < 0.9) * 80.0
+            np.fill_diagonal(self.recurrent_connectivity, 0)
+            _normalize_rows(self.recurrent_connectivity, 80.0)
+
+        population = NeuronPopulation.from_types(
+            neuron_types, self.external_connectivity, self.recurrent_connectivity, region, time_step=0.5
+        )
+        inhibitory = np.where(population.is_excitatory, 1.0, -0.3)
+        self.external_connectivity *= inhibitory[:, None]
+        if connectivity == "sparse":
+            self.recurrent_connectivity.scale_rows(inhibitory)
+        else:
+            self.recurrent_connectivity *= inhibitory[:, None]
+        if num_neurons > 6:  # Adjust Neuron 6
+            population.threshold[6] = -70.0  # Lower threshold
+        if backend != "object":
+            self.population = population
+        if backend == "object" or materialize_neurons:
+            self.neurons = self._build_neurons(neuron_types, region, rng)
+
+        if backend == "numba" and kernels.HAVE_NUMBA:
+            self.population.kernel = kernels.neuron_step
+        if plasticity == "trace":
+            mask = None if connectivity == "sparse" else self.recurrent_connectivity != 0
+            self.population.plasticity = TraceSTDP(self.recurrent_connectivity, mask=mask)
+        if delays is not None:
+            self.population.delays = SynapticDelays(self.recurrent_connectivity, delays)
+        if event_driven:
+            self.population.event_driven = True
+
+    def _build_neurons(self, neuron_types, region, rng):
+        num_inputs = self.num_inputs_per_neuron + self.num_neurons
+        # One block of weights for all neurons; each neuron holds a row view.
+        weights = rng.standard_normal((self.num_neurons, num_inputs)) * 0.3
+        biases = rng.standard_normal(self.num_neurons) * 0.2
+        neurons = [
+            GeneralizedNeuron(num_inputs, neuron_type, region, time_step=0.5, weights=weights[i], bias=biases[i])
+            for i, neuron_type in enumerate(neuron_types)
         ]
-        self.external_connectivity = np.random.rand(num_neurons, num_inputs_per_neuron)
-        self.external_connectivity = self.external_connectivity * (np.random.rand(num_neurons, num_inputs_per_neuron) < 0.85) * 80.0
-        for i in range(num_neurons):
-            norm = np.linalg.norm(self.external_connectivity[i])
-            if norm > 0:
-                self.external_connectivity[i] *= 80.0 / norm
-        self.recurrent_connectivity = np.random.rand(num_neurons, num_neurons)
-        self.recurrent_connectivity = self.recurrent_connectivity * (np.random.rand(num_neurons, num_neurons) < 0.9) * 80.0
-        np.fill_diagonal(self.recurrent_connectivity, 0)
-        for i in range(num_neurons):
-            norm = np.linalg.norm(self.recurrent_connectivity[i])
-            if norm > 0:
-                self.recurrent_connectivity[i] *= 80.0 / norm
-        for i, neuron in enumerate(self.neurons):
-            if not neuron.is_excitatory:
-                self.external_connectivity[i] *= -0.3
-                self.recurrent_connectivity[i] *= -0.3
-            if i == 6:  # Adjust Neuron 6
-                neuron.bias += 50.0  # Boost activation
-                neuron.threshold = -70.0  # Lower threshold
+        if self.num_neurons > 6:  # Adjust Neuron 6
+            neurons[6].bias += 50.0  # Boost activation
+            neurons[6].threshold = -70.0  # Lower threshold
+        return neurons
 
     def forward(self, inputs, previous_outputs=None):
         if previous_outputs is None:
             previous_outputs = np.zeros(self.num_neurons)
+        if self.population is not None:
+            outputs = self.population.step(inputs, previous_outputs)
+            if logger.isEnabledFor(TRACE):
+                self._trace(inputs, previous_outputs, outputs)
+            return outputs
         outputs = np.zeros(self.num_neurons)
         recurrent_inputs = np.dot(self.recurrent_connectivity, previous_outputs)
         for i, neuron in enumerate(self.neurons):
             external = self.external_connectivity[i] * inputs
             neuron_inputs = np.concatenate([external, recurrent_inputs])
             outputs[i] = neuron.forward(neuron_inputs)
-            state = neuron.get_state()
-            print(f"Neuron {i}: Current={np.sum(neuron_inputs):.2f}, Potential={state['membrane_potential']:.2f}, Spike={outputs[i]}")
+        if logger.isEnabledFor(TRACE):
+            self._trace(inputs, previous_outputs, outputs)
         return outputs
 
+    def _trace(self, inputs, previous_outputs, outputs):
+        currents = self.external_connectivity @ inputs + np.sum(self.recurrent_connectivity @ previous_outputs)
+        potentials = self.membrane_potentials()
+        for i in range(self.num_neurons):
+            logger.log(TRACE, "Neuron %d: Current=%.2f, Potential=%.2f, Spike=%s",
+                       i, currents[i], potentials[i], outputs[i])
+
     def get_state(self):
+        """Per-neuron state dicts; ``weights`` and ``bias`` are only present when the network has neuron objects."""
+        if self.neurons is None:
+            return self.population.get_state()
+        if self.population is not None:
+            self.population.sync_neurons(self.neurons)
         return [neuron.get_state() for neuron in self.neurons]
 
-    def simulate_network():
-        pass
+    def simulate_batch(self, inputs, plasticity=False):
+        """Run B independent trials of this network from its current state.
+
+        ``inputs`` has shape ``(B, T, num_inputs_per_neuron)``. Returns the
+        signed spike outputs and the membrane potentials, each ``(B, T, N)``.
+        The network itself is left untouched. With ``plasticity`` every trial
+        learns on its own copy of the recurrent weights.
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        if inputs.ndim != 3 or inputs.shape[2] != self.num_inputs_per_neuron:
+            raise ValueError("inputs must have shape (B, T, num_inputs_per_neuron)")
+        batch_size, time_steps, _ = inputs.shape
+        population = self.population
+        if population is None:
+            population = NeuronPopulation.from_neurons(
+                self.neurons, self.external_connectivity, self.recurrent_connectivity
+            )
+        population = population.batched(batch_size, plastic=plasticity)
+        spikes = np.zeros((batch_size, time_steps, self.num_neurons))
+        potentials = np.zeros((batch_size, time_steps, self.num_neurons))
+        outputs = np.zeros((batch_size, self.num_neurons))
+        for t in range(time_steps):
+            outputs = population.step(inputs[:, t], outputs)
+            spikes[:, t] = outputs
+            potentials[:, t] = population.membrane_potential
+        return spikes, potentials
+
+    def membrane_potentials(self):
+        """Membrane potential of every neuron, without building the state dicts.
+
+        Array backends return the live state array; copy it to keep a snapshot.
+        """
+        if self.population is not None:
+            return self.population.membrane_potential
+        return np.fromiter((neuron.membrane_potential for neuron in self.neurons), float, self.num_neurons)
+
+    def simulate_network(self, inputs, steps=None, recorders=(), previous_outputs=None, stream=False):
+        """Drive the network for ``steps`` steps and feed every step to ``recorders``.
+
+        ``inputs`` is an array of shape ``(T, num_inputs_per_neuron)``, an
+        iterable yielding one input vector per step, or a callable taking the
+        step index. ``steps`` defaults to the array length or to exhausting the
+        iterable and is required for callables. Returns the last outputs, or
+        with ``stream=True`` a generator of ``(step, outputs)`` pairs that runs
+        one step per item.
+        """
+        if callable(inputs):
+            if steps is None:
+                raise ValueError("steps is required when inputs is a callable")
+            source = map(inputs, range(steps))
+        elif isinstance(inputs, (np.ndarray, list, tuple)):
+            inputs = np.asarray(inputs, dtype=float)
+            if steps is None:
+                steps = len(inputs)
+            elif steps > len(inputs):
+                raise ValueError(f"steps={steps} exceeds the {len(inputs)} input rows")
+            source = iter(inputs)
+        else:
+            source = iter(inputs)
+        if previous_outputs is None:
+            previous_outputs = np.zeros(self.num_neurons)
+        run = self._run(source, steps, recorders, previous_outputs)
+        if stream:
+            return run
+        outputs = previous_outputs
+        for _, outputs in run:
+            pass
+        return outputs
+
+    def _run(self, source, steps, recorders, outputs):
+        for recorder in recorders:
+            recorder.start(self, steps)
+        try:
+            for step, inputs in enumerate(islice(source, steps)):
+                outputs = self.forward(inputs, outputs)
+                for recorder in recorders:
+                    recorder.record(step, outputs, self)
+                yield step, outputs
+        finally:
+            for recorder in recorders:
+                recorder.finish()
+
+def _normalize_rows(matrix, norm):
+    norms = np.linalg.norm(matrix, axis=1)
+    matrix *= np.divide(norm, norms, out=np.ones(len(matrix)), where=norms > 0)[:, None]
+
 
 if __name__ == "__main__":
     np.random.seed(42)  # Fixed seed
     network = NeuralNetwork(num_neurons=10, num_inputs_per_neuron=5)
     time_steps = 40
-    outputs = np.zeros(network.num_neurons)
-    for t in range(time_steps):
+
+    def noisy_inputs(t):
         base_inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
-        inputs = base_inputs + np.random.randn(5) * 100.0  # Increased noise to 100.0
-        outputs = network.forward(inputs, outputs)
+        return base_inputs + np.random.randn(5) * 100.0  # Increased noise to 100.0
+
+    for t, outputs in network.simulate_network(noisy_inputs, time_steps, stream=True):
         print(f"Step {t}: {outputs}")
-    print(f"Final: {outputs}")
-    simulate_network()
\ No newline at end of file
+    print(f"Final: {outputs}")
\ No newline at end of file
@@ -1,116 +1,225 @@
+import logging
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 import numpy as np
 import random
-from datetime import datetime
+from src.buffers import RingBuffer, RunningWindow
+from src.plasticity import TraceSTDP
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NeuronParameters:
+    rest_potential: float = -70.0
+    threshold: float = -65.0
+    base_threshold: float = -65.0
+    reset_potential: float = -80.0
+    leak_conductance: float = 0.02
+    refractory_period: float = 0.15
+    max_bursts: int = 3
+    min_potential: float = -85.0
+    adaptation_strength: float = 0.0006
+    adaptation_decay: float = 0.8
+    dendritic_split: float = 0.7
+    distal_attenuation: float = 0.5
+    stdp_window: float = 20.0
+    stdp_A_plus: float = 0.015
+    stdp_A_minus: float = 0.012
+    max_weight: float = 0.6
+    min_weight: float = -0.6
+    max_history: int = 5
+    output_scaling: float = 1.0
+    is_excitatory: bool = True
+    bias: float = None  # None keeps the randomly drawn bias
+
+
+@lru_cache(maxsize=None)
+def neuron_parameters(neuron_type, region):
+    """Shared, immutable parameter set for one ``(neuron_type, region)`` pair."""
+    neuron_type, region = neuron_type.lower(), region.lower()
+    values = {}
+    if neuron_type == "pyramidal":
+        values.update(base_threshold=-58.0, threshold=-58.0, leak_conductance=0.02, refractory_period=0.15,
+                      adaptation_strength=0.0006)
+    elif neuron_type == "interneuron":
+        values.update(base_threshold=-65.0, threshold=-65.0, leak_conductance=0.04, refractory_period=0.15,
+                      adaptation_strength=0.0006, is_excitatory=False)
+    elif neuron_type == "purkinje":
+        values.update(base_threshold=-50.0, threshold=-45.0 if region == "cerebellum" else -50.0,
+                      is_excitatory=False)
+    elif neuron_type == "sensory":
+        values.update(base_threshold=-65.0, threshold=-65.0)
+    elif neuron_type == "motor":
+        if region == "brainstem":
+            values.update(output_scaling=2.0 * 1.5)
+
+    if region == "cortex" and neuron_type == "pyramidal":
+        values.update(bias=180.0)
+    elif neuron_type == "interneuron":
+        values.update(bias=0.0)
+    return NeuronParameters(**values)
+
+
+@dataclass(frozen=True)
+class StepConstants:
+    """Per-step factors derived from one parameter set and time step.
+
+    ``stdp_kernel[k + offset]`` is the pairwise STDP weight change for a
+    postsynaptic spike ``k`` steps after a presynaptic one: ``A_plus *
+    exp(-k * dt / window)`` for ``k > 0``, ``-A_minus * exp(k * dt / window)``
+    for ``k < 0`` and zero outside the window or at ``k == 0``. The window
+    is closed: pairs exactly ``stdp_window`` apart count, within a relative
+    ``STDP_WINDOW_TOLERANCE`` that absorbs rounding of ``k * dt``.
+    """
+    params: NeuronParameters
+    time_step: float
+    adaptation_factor: float
+    stdp_kernel: np.ndarray
+    offset: int
+
+
+# Relative slack on the STDP window edge, so a pair whose lag is the window up to float rounding always counts.
+STDP_WINDOW_TOLERANCE = 1e-9
+
+
+@lru_cache(maxsize=1024)
+def step_constants(params, time_step):
+    """Shared ``StepConstants`` for ``params`` at ``time_step``.
+
+    Neurons of one ``(neuron_type, region)`` share their parameter set, so
+    this is computed once per ``(neuron_type, region, time_step)``; neurons
+    with overridden parameters get their own entry.
+    """
+    offset = int(np.ceil(params.stdp_window / time_step)) + 1  # Longest lag that fits in the spike rasters
+    dt = np.arange(-offset, offset + 1) * time_step
+    window = np.abs(dt) <= params.stdp_window * (1 + STDP_WINDOW_TOLERANCE)
+    kernel = np.where((dt > 0) & window, params.stdp_A_plus * np.exp(-dt / params.stdp_window), 0.0)
+    kernel -= np.where((dt < 0) & window, params.stdp_A_minus * np.exp(dt / params.stdp_window), 0.0)
+    kernel.setflags(write=False)
+    return StepConstants(params, time_step, float(np.exp(-params.adaptation_decay * time_step)), kernel, offset)
+
 
 class GeneralizedNeuron:
-    def __init__(self, num_inputs, neuron_type="generic", region="cortex", time_step=0.5):
+    __slots__ = ("num_inputs", "neuron_type", "region", "time_step", "params", "weights", "bias",
+                 "membrane_potential", "threshold", "refractory_time", "spike", "burst_count",
+                 "adaptation_current", "is_excitatory", "pre_spikes", "post_spikes", "input_history",
+                 "step_count", "plasticity", "stdp", "_constants")
+    transient_fields = ("_constants",)  # Caches rebuilt on demand, never checkpointed
+
+    def __init__(self, num_inputs, neuron_type="generic", region="cortex", time_step=0.5, plasticity="pairwise",
+                 weights=None, bias=None):
+        if plasticity not in ("pairwise", "trace"):
+            raise ValueError(f"Unknown plasticity {plasticity!r}; expected 'pairwise' or 'trace'")
         self.num_inputs = num_inputs
         self.neuron_type = neuron_type.lower()
         self.region = region.lower()
         self.time_step = time_step
-        self.weights = np.random.randn(num_inputs) * 0.3
-        self.bias = np.random.randn() * 0.2
-        self.rest_potential = -70.0
-        self.membrane_potential = self.rest_potential
-        self.threshold = -65.0
-        self.base_threshold = -65.0
-        self.reset_potential = -80.0
-        self.leak_conductance = 0.02
-        self.refractory_period = 0.15
+        self.weights = np.random.randn(num_inputs) * 0.3 if weights is None else weights
+        self.bias = np.random.randn() * 0.2 if bias is None else bias
         self.refractory_time = 0.0
         self.spike = 0
         self.burst_count = 0
-        self.max_bursts = 3
-        self.min_potential = -85.0
         self.adaptation_current = 0.0
-        self.adaptation_strength = 0.0006
-        self.adaptation_decay = 0.8
-        self.dendritic_split = 0.7
-        self.proximal_weights = self.weights[:int(num_inputs * self.dendritic_split)]
-        self.distal_weights = self.weights[int(num_inputs * self.dendritic_split):]
-        self.distal_attenuation = 0.5
-        self.stdp_window = 20.0
-        self.stdp_A_plus = 0.015
-        self.stdp_A_minus = 0.012
-        self.pre_spike_times = [[] for _ in range(num_inputs)]
-        self.post_spike_times = []
-        self.max_weight = 0.6
-        self.min_weight = -0.6
-        self.input_history = []
-        self.max_history = 5
-        self.output_scaling = 1.0
-
-        if self.neuron_type == "interneuron" or self.neuron_type == "purkinje":
-            self.is_excitatory = False
-        else:
-            self.is_excitatory = True
+        self.step_count = 0
+        self.plasticity = plasticity
+        self._constants = None
 
         self.configure_properties()
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Initialized {self.neuron_type} with is_excitatory={self.is_excitatory}")
+        params = self.params
+        history = RunningWindow if self.neuron_type == "sensory" else RingBuffer
+        self.input_history = history(params.max_history, (num_inputs,))
+        self.pre_spikes = None
+        self.post_spikes = None
+        self.stdp = None
+        if plasticity == "trace":
+            self.stdp = TraceSTDP(self.weights.reshape(1, -1), params.stdp_window, params.stdp_A_plus,
+                                  params.stdp_A_minus, params.min_weight, params.max_weight)
+        else:
+            # One raster row per step inside the STDP window. Postsynaptic spikes
+            # are pruned a step later than presynaptic ones, hence the extra row.
+            window_steps = int(np.ceil(params.stdp_window / time_step))
+            self.pre_spikes = RingBuffer(window_steps, (num_inputs,), bool)
+            self.post_spikes = RingBuffer(window_steps + 1, (), bool)
+        logger.debug("Initialized %s with is_excitatory=%s", self.neuron_type, self.is_excitatory)
 
     def configure_properties(self):
-        if self.neuron_type == "pyramidal":
-            self.base_threshold = -58.0
-            self.threshold = -58.0
-            self.leak_conductance = 0.02
-            self.refractory_period = 0.15
-            self.adaptation_strength = 0.0006
-        elif self.neuron_type == "interneuron":
-            self.base_threshold = -65.0
-            self.threshold = -65.0
-            self.leak_conductance = 0.04
-            self.refractory_period = 0.15
-            self.adaptation_strength = 0.0006
-            self.is_excitatory = False
-        elif self.neuron_type == "purkinje":
-            self.base_threshold = -50.0
-            self.threshold = -50.0
-            self.is_excitatory = False
-            if self.region == "cerebellum":
-                self.threshold = -45.0
-        elif self.neuron_type == "sensory":
-            self.base_threshold = -65.0
-            self.threshold = -65.0
-        elif self.neuron_type == "motor":
-            if self.region == "brainstem":
-                self.output_scaling = 2.0 * 1.5
-
-        if self.region == "cortex" and self.neuron_type == "pyramidal":
-            self.bias = 180.0
-        elif self.neuron_type == "interneuron":
-            self.bias = 0.0
+        self.params = neuron_parameters(self.neuron_type, self.region)
+        self.membrane_potential = self.params.rest_potential
+        self.threshold = self.params.threshold
+        self.is_excitatory = self.params.is_excitatory
+        if self.params.bias is not None:
+            self.bias = self.params.bias
+
+    @property
+    def proximal_weights(self):
+        return self.weights[:int(self.num_inputs * self.params.dendritic_split)]
+
+    @property
+    def distal_weights(self):
+        return self.weights[int(self.num_inputs * self.params.dendritic_split):]
+
+    @property
+    def pre_spike_times(self):
+        if self.pre_spikes is None:
+            return [[] for _ in range(self.num_inputs)]
+        raster = self.pre_spikes.to_array()
+        times = self._window_times(len(raster))
+        return [times[raster[:, i]].tolist() for i in range(self.num_inputs)]
+
+    @property
+    def post_spike_times(self):
+        if self.post_spikes is None:
+            return []
+        raster = self.post_spikes.to_array()
+        return self._window_times(len(raster))[raster].tolist()
+
+    @property
+    def constants(self):
+        """``StepConstants`` for the current parameters, refetched whenever ``params`` or ``time_step`` change."""
+        constants = self._constants
+        if constants is None or constants.params is not self.params or constants.time_step != self.time_step:
+            constants = self._constants = step_constants(self.params, self.time_step)
+        return constants
+
+    def _window_times(self, length):
+        # Times of the last ``length`` steps, oldest first
+        return np.arange(self.step_count - length, self.step_count) * self.time_step
 
     def forward(self, inputs):
         if len(inputs) != self.num_inputs:
             raise ValueError("Number of inputs must match number of weights")
         inputs = np.array(inputs)
-        current_time = len(self.input_history) * self.time_step
+        params = self.params
+        current_time = self.step_count * self.time_step
+        self.step_count += 1
         self.input_history.append(inputs)
-        if len(self.input_history) > self.max_history:
-            self.input_history.pop(0)
-        for i in range(self.num_inputs):
-            if inputs[i] > 0.5:
-                self.pre_spike_times[i].append(current_time)
-            self.pre_spike_times[i] = [t for t in self.pre_spike_times[i] if current_time - t < self.stdp_window]
+        if self.stdp is None:
+            self.pre_spikes.append(inputs > 0.5)
         self.adapt_behavior(inputs)
         self.refractory_time = max(0, self.refractory_time - self.time_step)
-        self.adaptation_current *= np.exp(-self.adaptation_decay * self.time_step)
+        self.adaptation_current *= self.constants.adaptation_factor
         if self.refractory_time <= 0 and self.membrane_potential >= self.threshold:
             self.spike = 1
-            self.membrane_potential = self.reset_potential
-            self.refractory_time = self.refractory_period
-            self.adaptation_current += self.adaptation_strength
-            self.post_spike_times.append(current_time)
-            if self.neuron_type == "pyramidal" and self.burst_count < self.max_bursts:
+            self.membrane_potential = params.reset_potential
+            self.refractory_time = params.refractory_period
+            self.adaptation_current += params.adaptation_strength
+            if self.neuron_type == "pyramidal" and self.burst_count < params.max_bursts:
                 self.burst_count += 1
-                self.refractory_time = self.refractory_period / 2
-            self.update_weights(inputs)
-            output_value = self.output_scaling
+                self.refractory_time = params.refractory_period / 2
+            if self.stdp is None:
+                self.post_spikes.append(True)
+                self.update_weights(inputs)
+            output_value = params.output_scaling
         else:
             self.spike = 0
             self.burst_count = 0
             output_value = 0.0
-        self.post_spike_times = [t for t in self.post_spike_times if current_time - t < self.stdp_window]
+            if self.stdp is None:
+                self.post_spikes.append(False)
+        if self.stdp is not None:
+            self.stdp.weights = self.weights.reshape(1, -1)
+            self.stdp.step(current_time, inputs > 0.5, [self.spike])
         if self.is_excitatory:
             return self.spike * output_value
         else:
@@ -119,7 +228,7 @@ class GeneralizedNeuron:
     def adapt_behavior(self, inputs):
         if self.neuron_type == "sensory":
             if len(self.input_history) > 1:
-                input_variance = np.var(np.vstack(self.input_history), axis=0).mean()
+                input_variance = self.input_history.variance().mean()
                 if input_variance > 0.5:
                     self.threshold = max(-70.0, self.threshold - 2.0)
                 else:
@@ -131,22 +240,22 @@ class GeneralizedNeuron:
                 self.is_excitatory = True
 
     def update_weights(self, inputs):
-        current_time = len(self.input_history) * self.time_step
-        for i in range(self.num_inputs):
-            delta_w = 0.0
-            for pre_t in self.pre_spike_times[i]:
-                for post_t in self.post_spike_times:
-                    dt = post_t - pre_t
-                    if dt > 0 and dt <= self.stdp_window:
-                        delta_w += self.stdp_A_plus * np.exp(-dt / self.stdp_window)
-                    elif dt < 0 and abs(dt) <= self.stdp_window:
-                        delta_w -= self.stdp_A_minus * np.exp(dt / self.stdp_window)
-            new_weight = np.clip(self.weights[i] + delta_w, self.min_weight, self.max_weight)
-            self.weights[i] = new_weight
-            if i < len(self.proximal_weights):
-                self.proximal_weights[i] = new_weight
-            else:
-                self.distal_weights[i - len(self.proximal_weights)] = new_weight
+        params = self.params
+        constants = self.constants
+        pre = self.pre_spikes.to_array()
+        post = self.post_spikes.to_array()
+        # Both rasters end at the current step, so summed over postsynaptic spikes the kernel of every
+        # presynaptic row is a cross-correlation of the post raster with the lookup table.
+        table = constants.stdp_kernel
+        shift = len(pre) - len(post) + constants.offset
+        # Rasters sized for another time_step may need lags past the table ends, which lie outside the window.
+        pad = max(len(pre) - 1 - shift, shift - (len(table) - len(post)), 0)
+        if pad:
+            table = np.pad(table, pad)
+            shift += pad
+        correlation = np.correlate(table, post.astype(float), "valid")
+        delta_w = correlation[shift - np.arange(len(pre))] @ pre
+        self.weights[:] = np.clip(self.weights + delta_w, params.min_weight, params.max_weight)
 
     def get_state(self):
         return {
@@ -162,4 +271,19 @@ class GeneralizedNeuron:
             "output_scaling": self.output_scaling,
             "burst_count": self.burst_count,
             "adaptation_current": self.adaptation_current
-        }
\ No newline at end of file
+        }
+
+def _parameter_property(name):
+    def get(self):
+        return getattr(self.params, name)
+
+    def set(self, value):
+        # Overriding a constant gives this neuron a private copy of the table entry.
+        self.params = replace(self.params, **{name: value})
+
+    return property(get, set)
+
+
+for _field in fields(NeuronParameters):
+    if _field.name not in GeneralizedNeuron.__slots__:
+        setattr(GeneralizedNeuron, _field.name, _parameter_property(_field.name))
@@ -0,0 +1,246 @@
+import logging
+import multiprocessing
+import queue
+import time
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+from src.connectivity import SparseConnectivity
+from src.diagnostics import TRACE
+from src.network import NeuralNetwork
+
+logger = logging.getLogger(__name__)
+
+_STEP, _STOP = 0, 1
+
+
+class ParallelNeuralNetwork(NeuralNetwork):
+    """NeuralNetwork whose neurons are split into contiguous blocks, one per worker process.
+
+    The network is built exactly like the serial one, then its state arrays,
+    recurrent weights and per-step exchange vectors are moved into shared
+    memory. Every step runs in two phases, each ended by every worker
+    reporting back to the parent: each worker
+    writes its rows of the recurrent drive, then advances its neurons against
+    the full drive vector and writes its slice of the outputs. Outputs match
+    the serial ``forward`` of the same network.
+
+    State stays readable from the parent (``membrane_potentials``,
+    ``get_state``, recorders). Call ``close`` (or use the network as a context
+    manager) to stop the workers; the network then keeps a private copy of
+    its state and runs serially.
+
+    The parent waits at most ``timeout`` seconds for the workers in every
+    phase and checks between polls that they are alive, so a worker killed by
+    a signal or the OOM killer raises a ``RuntimeError`` instead of hanging
+    the run. Phases are signalled with semaphores rather than a shared
+    ``Barrier``, whose wake-up waits on every sleeping party and never
+    returns once one of them has died.
+    """
+
+    def __init__(self, num_neurons, num_inputs_per_neuron, neuron_types=None, workers=2, backend="numpy",
+                 start_method=None, timeout=60.0, **kwargs):
+        if backend == "object":
+            raise ValueError("ParallelNeuralNetwork requires an array backend such as 'numpy'")
+        if not 1 <= workers <= num_neurons:
+            raise ValueError("workers must be between 1 and num_neurons")
+        if kwargs.get("delays") is not None:
+            raise ValueError("ParallelNeuralNetwork does not support synaptic delays")
+        super().__init__(num_neurons, num_inputs_per_neuron, neuron_types, backend=backend, **kwargs)
+        self.workers = workers
+        self.timeout = timeout
+        self._start_workers(multiprocessing.get_context(start_method))
+
+    def _start_workers(self, context):
+        population = self.population
+        blocks, specs = [], {}
+
+        def share(key, array):
+            array = np.asarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            specs[key] = (block.name, array.shape, array.dtype.str)
+            view = _view(block, array.shape, array.dtype)
+            view[...] = array
+            return view
+
+        for name in population.state_fields:
+            setattr(population, name, share(name, getattr(population, name)))
+        weights = population.recurrent_connectivity
+        if isinstance(weights, SparseConnectivity):
+            weights.data = share("weights", weights.data)
+        else:
+            weights = share("weights", weights)
+            self._rebind_weights(weights)
+        self._inputs = share("inputs", np.zeros(self.num_inputs_per_neuron))
+        self._previous = share("previous", np.zeros(self.num_neurons))
+        self._drive = share("drive", np.zeros(self.num_neurons))
+        self._outputs = share("outputs", np.zeros(self.num_neurons))
+        self._control = share("control", np.zeros(1, dtype=np.int64))
+
+        self._done = context.Semaphore(0)
+        self._go = []
+        self._failed = False
+        self._results = context.Queue()
+        bounds = np.linspace(0, self.num_neurons, self.workers + 1).astype(int)
+        self._processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            partition = population.partition(start, stop)
+            go = context.Semaphore(0)  # One per worker, so a fast worker cannot take another's turn
+            self._go.append(go)
+            if isinstance(weights, SparseConnectivity):
+                weight_range = (weights.indptr[start], weights.indptr[stop])
+            else:
+                weight_range = (start, stop)
+            process = context.Process(
+                target=_worker, daemon=True,
+                args=(partition, start, stop, weight_range, specs, go, self._done, self._results),
+            )
+            process.start()
+            self._processes.append(process)
+        self._blocks = blocks
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes, blocks)
+        logger.debug("Started %d workers over %d neurons", self.workers, self.num_neurons)
+
+    def _rebind_weights(self, weights):
+        self.recurrent_connectivity = weights
+        self.population.recurrent_connectivity = weights
+        if self.population.plasticity is not None:
+            self.population.plasticity.weights = weights
+
+    def forward(self, inputs, previous_outputs=None):
+        if not self._processes:
+            return super().forward(inputs, previous_outputs)
+        if previous_outputs is None:
+            previous_outputs = np.zeros(self.num_neurons)
+        self._inputs[:] = inputs
+        self._previous[:] = previous_outputs
+        self._control[0] = _STEP
+        for _ in range(2):  # Drive written, outputs written
+            self._run_phase()
+        self.population.step_count += 1
+        outputs = self._outputs.copy()
+        if logger.isEnabledFor(TRACE):
+            self._trace(inputs, previous_outputs, outputs)
+        return outputs
+
+    def _run_phase(self):
+        # Let every worker run one phase and wait until all of them report back.
+        for go in self._go:
+            go.release()
+        deadline = time.monotonic() + self.timeout
+        for _ in self._processes:
+            while not self._done.acquire(timeout=0.1):
+                dead = [f"pid {process.pid} (exit code {process.exitcode})"
+                        for process in self._processes if not process.is_alive()]
+                if dead:
+                    self._failed = True
+                    raise RuntimeError(f"ParallelNeuralNetwork workers died: {', '.join(dead)}; "
+                                       "see their traceback above")
+                if time.monotonic() > deadline:
+                    self._failed = True
+                    raise RuntimeError(f"ParallelNeuralNetwork workers did not respond within {self.timeout} s")
+
+    def close(self):
+        """Stop the workers and move the state back into private memory."""
+        if not self._processes:
+            return
+        self._control[0] = _STOP
+        population = self.population
+        if not self._failed:
+            for go in self._go:
+                go.release()
+            try:
+                # Workers hand back what only they advanced: the sensory input
+                # history (identical in every worker) and their STDP traces.
+                for _ in self._processes:
+                    start, stop, histories, traces = self._results.get(timeout=self.timeout)
+                    population._external_history, population._recurrent_history = histories
+                    if traces is not None:
+                        stdp = population.plasticity
+                        stdp.pre_trace[:], stdp.pre_time[:] = traces[:2]
+                        stdp.post_trace[start:stop], stdp.post_time[start:stop] = traces[2:]
+            except queue.Empty:
+                self._failed = True
+        if self._failed:
+            # Surviving workers may be stuck mid-step, so they are not waited for.
+            logger.warning("A worker failed; the sensory history and STDP traces may be stale")
+        for process in self._processes:
+            process.join(0 if self._failed else self.timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for name in population.state_fields:
+            setattr(population, name, getattr(population, name).copy())
+        weights = population.recurrent_connectivity
+        if isinstance(weights, SparseConnectivity):
+            weights.data = weights.data.copy()
+        else:
+            self._rebind_weights(weights.copy())
+        del self._inputs, self._previous, self._drive, self._outputs, self._control
+        self._processes = []
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _view(block, shape, dtype):
+    # frombuffer holds a buffer export, so the block cannot be unmapped under a live array.
+    dtype = np.dtype(dtype)
+    return np.frombuffer(block.buf, dtype, int(np.prod(shape))).reshape(shape)
+
+
+def _shutdown(processes, blocks):
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+            process.join()
+    for block in blocks:
+        block.unlink()
+        try:
+            block.close()
+        except BufferError:
+            # The caller still holds an array on this block; the mapping is
+            # released together with that array instead.
+            block._mmap = None
+
+
+def _worker(partition, start, stop, weight_range, specs, go, done, results):
+    blocks, arrays = [], {}
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype, buffer=block.buf)
+    # Partitions arrive as copies under the spawn start method; point them back at shared memory.
+    for name in partition.state_fields:
+        setattr(partition, name, arrays[name][start:stop])
+    weights = arrays["weights"][weight_range[0]:weight_range[1]]
+    if isinstance(partition.recurrent_connectivity, SparseConnectivity):
+        partition.recurrent_connectivity.data = weights
+    else:
+        partition.recurrent_connectivity = weights
+        if partition.plasticity is not None:
+            partition.plasticity.weights = weights
+    inputs, previous, drive, outputs = arrays["inputs"], arrays["previous"], arrays["drive"], arrays["outputs"]
+    control = arrays["control"]
+    # A worker that raises simply exits; the parent notices it is no longer alive.
+    while True:
+        go.acquire()
+        if control[0] == _STOP:
+            stdp = partition.plasticity
+            traces = None if stdp is None else (stdp.pre_trace, stdp.pre_time, stdp.post_trace, stdp.post_time)
+            histories = (partition._external_history, partition._recurrent_history)
+            results.put((start, stop, histories, traces))
+            break
+        drive[start:stop] = partition.recurrent_drive(previous)
+        done.release()
+        go.acquire()
+        current_time = partition.step_count * partition.time_step
+        outputs[start:stop] = partition.advance(inputs, drive)
+        if partition.plasticity is not None:
+            partition.plasticity.step(current_time, previous, partition.spike)
+        done.release()
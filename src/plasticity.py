@@ -0,0 +1,135 @@
+import copy
+import numpy as np
+from src.connectivity import SparseConnectivity, concat_ranges
+
+
+class TraceSTDP:
+    """Event-driven STDP using exponentially decaying pre- and postsynaptic traces.
+
+    Each presynaptic source keeps a trace that jumps by one on every spike and
+    decays with time constant ``stdp_window``; postsynaptic neurons keep the
+    same kind of trace. A postsynaptic spike potentiates its incoming synapses
+    by ``A_plus`` times the presynaptic trace, and a presynaptic spike depresses
+    its outgoing synapses by ``A_minus`` times the postsynaptic trace. Traces are
+    decayed lazily from the time of their last event, so a spike only touches
+    the synapses it belongs to.
+
+    This is the all-to-all pairwise rule of ``GeneralizedNeuron.update_weights``
+    with every pair counted once, for pairs closer than ``stdp_window``. Unlike
+    the pairwise rule it has no hard cutoff at the window, and depression is
+    applied when the late presynaptic spike arrives rather than at the next
+    postsynaptic spike. Simultaneous pre and post spikes do not interact.
+
+    ``weights`` is either a ``(num_post, num_pre)`` array or a
+    ``SparseConnectivity`` and is updated in place. For dense weights an
+    optional boolean ``mask`` marks the synapses that exist; the rest stay put.
+
+    ``batched`` returns the rule for independent trials: traces and spikes
+    gain a leading trial axis, dense weights become ``(B, num_post, num_pre)``
+    and sparse ``data`` becomes ``(B, nnz)`` over the shared structure.
+    """
+
+    def __init__(self, weights, stdp_window=20.0, A_plus=0.015, A_minus=0.012, min_weight=None, max_weight=None,
+                 mask=None):
+        self.weights = weights
+        self.mask = mask
+        self.stdp_window = stdp_window
+        self.A_plus = A_plus
+        self.A_minus = A_minus
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        num_post, num_pre = weights.shape[-2:]
+        if isinstance(weights, SparseConnectivity):
+            batch_shape = weights.data.shape[:-1]
+        else:
+            batch_shape = weights.shape[:-2]
+        self.pre_trace = np.zeros(batch_shape + (num_pre,))
+        self.pre_time = np.zeros(batch_shape + (num_pre,))
+        self.post_trace = np.zeros(batch_shape + (num_post,))
+        self.post_time = np.zeros(batch_shape + (num_post,))
+
+    def batched(self, batch_size):
+        """``batch_size`` independent copies of the rule, its weights and its traces, stacked by trial."""
+        if isinstance(self.weights, SparseConnectivity):
+            weights = copy.copy(self.weights)  # The structure and its column index are shared
+            weights.data = np.repeat(self.weights.data[None], batch_size, axis=0)
+        else:
+            weights = np.repeat(self.weights[None], batch_size, axis=0)
+        batch = TraceSTDP(weights, self.stdp_window, self.A_plus, self.A_minus, self.min_weight, self.max_weight,
+                          self.mask)
+        batch.pre_trace[:], batch.pre_time[:] = self.pre_trace, self.pre_time
+        batch.post_trace[:], batch.post_time[:] = self.post_trace, self.post_time
+        return batch
+
+    def row_slice(self, start, stop, weights):
+        """The rule restricted to postsynaptic rows ``start:stop``, learning on ``weights``."""
+        mask = None if self.mask is None else self.mask[start:stop]
+        part = TraceSTDP(weights, self.stdp_window, self.A_plus, self.A_minus, self.min_weight, self.max_weight,
+                         mask)
+        part.pre_trace[:] = self.pre_trace
+        part.pre_time[:] = self.pre_time
+        part.post_trace[:] = self.post_trace[start:stop]
+        part.post_time[:] = self.post_time[start:stop]
+        return part
+
+    def step(self, time, pre_spikes, post_spikes):
+        # Spikes as index tuples: (neurons,) for a single run, (trials, neurons) for a batch.
+        pre = np.nonzero(pre_spikes)
+        post = np.nonzero(post_spikes)
+        if pre[-1].size == 0 and post[-1].size == 0:
+            return
+        if isinstance(self.weights, SparseConnectivity):
+            self._update_sparse(time, pre, post)
+        else:
+            self._update_dense(time, pre, post)
+        self.pre_trace[pre] = self.pre_trace[pre] * np.exp((self.pre_time[pre] - time) / self.stdp_window) + 1.0
+        self.pre_time[pre] = time
+        self.post_trace[post] = self.post_trace[post] * np.exp((self.post_time[post] - time) / self.stdp_window) + 1.0
+        self.post_time[post] = time
+
+    def _update_dense(self, time, pre, post):
+        # pre[:-1] and post[:-1] pick the trial of every spike; they are empty for a single run.
+        # Every block of weights is gathered once, since a batch's blocks do not stay in cache.
+        weights = self.weights
+        if post[-1].size:
+            pre_trace = self.pre_trace * np.exp((self.pre_time - time) / self.stdp_window)
+            current = weights[post]
+            updated = self._clip(current + self.A_plus * pre_trace[post[:-1]])
+            weights[post] = updated if self.mask is None else np.where(self.mask[post[-1]], updated, current)
+        if pre[-1].size:
+            # Rows first, so that gathering the spiking columns of every trial reads the weights row by row.
+            rows = np.moveaxis(weights, -2, 0)
+            columns = (slice(None),) + pre
+            post_trace = self.post_trace * np.exp((self.post_time - time) / self.stdp_window)
+            post_trace = np.moveaxis(post_trace, -1, 0)[columns[:-1]].reshape(len(rows), -1)
+            current = rows[columns]
+            updated = self._clip(current - self.A_minus * post_trace)
+            rows[columns] = updated if self.mask is None else np.where(self.mask[:, pre[-1]], updated, current)
+
+    def _update_sparse(self, time, pre, post):
+        weights = self.weights
+        if post[-1].size:
+            starts, ends = weights.indptr[post[-1]], weights.indptr[post[-1] + 1]
+            synapses = concat_ranges(starts, ends)
+            trials = tuple(np.repeat(trial, ends - starts) for trial in post[:-1])
+            columns = weights.indices[synapses]
+            pre_trace = self.pre_trace[trials + (columns,)]
+            pre_trace = pre_trace * np.exp((self.pre_time[trials + (columns,)] - time) / self.stdp_window)
+            data = trials + (synapses,)
+            weights.data[data] = self._clip(weights.data[data] + self.A_plus * pre_trace)
+        if pre[-1].size:
+            order, column_ptr, row_of = weights.column_index()
+            starts, ends = column_ptr[pre[-1]], column_ptr[pre[-1] + 1]
+            synapses = order[concat_ranges(starts, ends)]
+            trials = tuple(np.repeat(trial, ends - starts) for trial in pre[:-1])
+            rows = row_of[synapses]
+            post_trace = self.post_trace[trials + (rows,)]
+            post_trace = post_trace * np.exp((self.post_time[trials + (rows,)] - time) / self.stdp_window)
+            data = trials + (synapses,)
+            weights.data[data] = self._clip(weights.data[data] - self.A_minus * post_trace)
+
+    def _clip(self, values):
+        if self.min_weight is None and self.max_weight is None:
+            return values
+        return np.clip(values, self.min_weight, self.max_weight)
+
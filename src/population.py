@@ -0,0 +1,395 @@
+import copy
+import numpy as np
+from src.buffers import RunningWindow
+from src.connectivity import SparseConnectivity
+from src.kernels import neuron_kinds
+from src.neuron import neuron_parameters
+from src.plasticity import TraceSTDP
+
+
+class NeuronPopulation:
+    """Struct-of-arrays engine that advances a whole population per step.
+
+    Every neuron sees the same input layout as the object path in
+    ``NeuralNetwork.forward``: its own row of external currents followed by
+    the full recurrent drive vector. Spikes match ``GeneralizedNeuron.forward``
+    step for step; synaptic weights are not tracked here.
+    """
+
+    def __init__(self, external_connectivity, recurrent_connectivity, membrane_potential, threshold,
+                 base_threshold, reset_potential, refractory_period, adaptation_strength, adaptation_decay,
+                 output_scaling, is_excitatory, neuron_types, max_bursts=3, max_history=5, time_step=0.5,
+                 region="cortex"):
+        self.external_connectivity = external_connectivity
+        self.recurrent_connectivity = recurrent_connectivity
+        self.num_neurons = external_connectivity.shape[0]
+        self.num_inputs = external_connectivity.shape[1] + recurrent_connectivity.shape[1]
+        self.time_step = time_step
+        self.region = region
+        self.max_history = max_history
+
+        self.membrane_potential = np.array(membrane_potential, dtype=float)
+        self.threshold = np.array(threshold, dtype=float)
+        self.refractory_time = np.zeros(self.num_neurons)
+        self.adaptation_current = np.zeros(self.num_neurons)
+        self.burst_count = np.zeros(self.num_neurons, dtype=np.int64)
+        self.is_excitatory = np.array(is_excitatory, dtype=bool)
+        self.spike = np.zeros(self.num_neurons, dtype=np.int64)
+        self.last_update = np.zeros(self.num_neurons, dtype=np.int64)
+
+        self.base_threshold = np.array(base_threshold, dtype=float)
+        self.reset_potential = np.array(reset_potential, dtype=float)
+        self.refractory_period = np.array(refractory_period, dtype=float)
+        self.adaptation_strength = np.array(adaptation_strength, dtype=float)
+        self.adaptation_factor = np.exp(-np.asarray(adaptation_decay, dtype=float) * time_step)
+        self.output_scaling = np.array(output_scaling, dtype=float)
+        self.max_bursts = np.broadcast_to(np.asarray(max_bursts), (self.num_neurons,)).copy()
+
+        self.neuron_types = neuron_types = np.asarray(neuron_types)
+        self.is_pyramidal = neuron_types == "pyramidal"
+        self.sensory_index = np.flatnonzero(neuron_types == "sensory")
+        self.interneuron_index = np.flatnonzero(neuron_types == "interneuron")
+
+        self._external_history = RunningWindow(max_history, (external_connectivity.shape[1],))
+        self._recurrent_history = RunningWindow(max_history, (recurrent_connectivity.shape[1],))
+        self.step_count = 0
+        self.batch_size = None
+        self.plasticity = None
+        self.delays = None  # Optional SynapticDelays on the recurrent weights
+        self.kernel = None  # Optional compiled step, see src.kernels.neuron_step
+        self._event_driven = False
+
+    state_fields = ("membrane_potential", "threshold", "refractory_time", "adaptation_current",
+                    "burst_count", "is_excitatory", "spike", "last_update")
+    parameter_fields = ("base_threshold", "reset_potential", "refractory_period", "adaptation_strength",
+                        "adaptation_factor", "output_scaling", "max_bursts", "neuron_types", "is_pyramidal")
+
+    @classmethod
+    def from_neurons(cls, neurons, external_connectivity, recurrent_connectivity):
+        time_steps = {neuron.time_step for neuron in neurons}
+        if len(time_steps) != 1:
+            raise ValueError("All neurons must share the same time_step")
+        population = cls(
+            external_connectivity,
+            recurrent_connectivity,
+            membrane_potential=[n.membrane_potential for n in neurons],
+            threshold=[n.threshold for n in neurons],
+            base_threshold=[n.base_threshold for n in neurons],
+            reset_potential=[n.reset_potential for n in neurons],
+            refractory_period=[n.refractory_period for n in neurons],
+            adaptation_strength=[n.adaptation_strength for n in neurons],
+            adaptation_decay=[n.adaptation_decay for n in neurons],
+            output_scaling=[n.output_scaling for n in neurons],
+            is_excitatory=[n.is_excitatory for n in neurons],
+            neuron_types=[n.neuron_type for n in neurons],
+            max_bursts=[n.max_bursts for n in neurons],
+            max_history=neurons[0].max_history,
+            time_step=time_steps.pop(),
+            region=neurons[0].region,
+        )
+        population.refractory_time[:] = [n.refractory_time for n in neurons]
+        population.adaptation_current[:] = [n.adaptation_current for n in neurons]
+        population.burst_count[:] = [n.burst_count for n in neurons]
+        return population
+
+    @classmethod
+    def from_types(cls, neuron_types, external_connectivity, recurrent_connectivity, region="cortex",
+                   time_step=0.5):
+        # Parameters come from the shared (neuron_type, region) table, looked up
+        # once per distinct type, so no per-neuron objects are built.
+        unique_types, inverse = np.unique(np.asarray(neuron_types, dtype=str), return_inverse=True)
+        table = [neuron_parameters(neuron_type, region) for neuron_type in unique_types]
+
+        def column(name):
+            return np.array([getattr(params, name) for params in table])[inverse]
+
+        return cls(
+            external_connectivity,
+            recurrent_connectivity,
+            membrane_potential=column("rest_potential"),
+            threshold=column("threshold"),
+            base_threshold=column("base_threshold"),
+            reset_potential=column("reset_potential"),
+            refractory_period=column("refractory_period"),
+            adaptation_strength=column("adaptation_strength"),
+            adaptation_decay=column("adaptation_decay"),
+            output_scaling=column("output_scaling"),
+            is_excitatory=column("is_excitatory"),
+            neuron_types=np.char.lower(unique_types)[inverse],
+            max_bursts=column("max_bursts"),
+            max_history=int(column("max_history").max()),
+            time_step=time_step,
+            region=region.lower(),
+        )
+
+    @property
+    def event_driven(self):
+        """Advance only the neurons that can fire instead of every neuron on every step.
+
+        The membrane potential only changes when a neuron fires, so a neuron
+        below threshold needs no work. Its refractory time and adaptation
+        current are brought up to date in closed form when it next crosses
+        threshold or when ``materialize`` is called, using ``last_update``,
+        the step up to which its state is current. The recurrent drive only
+        gathers the weights of neurons that fired on the previous step. Spikes
+        match the fixed-step update; applies to unbatched populations without
+        a compiled ``kernel``.
+        """
+        return self._event_driven
+
+    @event_driven.setter
+    def event_driven(self, enabled):
+        if enabled and self.batch_size is not None:
+            raise ValueError("Batched populations cannot be event driven")
+        if enabled and self.kernel is not None:
+            raise ValueError("Populations with a compiled kernel cannot be event driven")
+        if enabled and not self._event_driven:
+            self.last_update[:] = self.step_count
+        elif self._event_driven and not enabled:
+            self.materialize()
+        self._event_driven = bool(enabled)
+
+    def materialize(self, index=slice(None)):
+        """Bring the lazily decayed state of neurons ``index`` up to the current step."""
+        if not self._event_driven:
+            return
+        skipped = self.step_count - self.last_update[index]
+        # Replay the per-step subtraction instead of ``rt - k * dt``, which rounds differently for a
+        # time step such as 0.1 and can end a refractory period one step early. It reaches zero
+        # within refractory_period / time_step steps, so the loop is short.
+        refractory_time = self.refractory_time[index]
+        pending = np.minimum(skipped, np.ceil(refractory_time / self.time_step) + 1)
+        while np.any(pending > 0):
+            np.maximum(refractory_time - self.time_step, 0.0, out=refractory_time, where=pending > 0)
+            pending -= 1
+        self.refractory_time[index] = refractory_time
+        self.adaptation_current[index] *= self.adaptation_factor[index] ** skipped
+        self.last_update[index] = self.step_count
+
+    def sync_neurons(self, neurons):
+        self.materialize()
+        for i, neuron in enumerate(neurons):
+            neuron.membrane_potential = float(self.membrane_potential[i])
+            neuron.threshold = float(self.threshold[i])
+            neuron.refractory_time = float(self.refractory_time[i])
+            neuron.adaptation_current = float(self.adaptation_current[i])
+            neuron.burst_count = int(self.burst_count[i])
+            neuron.is_excitatory = bool(self.is_excitatory[i])
+            neuron.spike = int(self.spike[i])
+
+    def get_state(self):
+        """One state dict per neuron, with the keys of ``GeneralizedNeuron.get_state`` except ``weights`` and ``bias``.
+
+        Those belong to the neuron objects of the object backend; a population
+        keeps its weights in ``external_connectivity`` and
+        ``recurrent_connectivity`` and has no per-neuron bias.
+        """
+        self.materialize()
+        return [
+            {
+                "neuron_type": str(self.neuron_types[i]),
+                "region": self.region,
+                "membrane_potential": float(self.membrane_potential[i]),
+                "spike": int(self.spike[i]),
+                "is_excitatory": bool(self.is_excitatory[i]),
+                "threshold": float(self.threshold[i]),
+                "refractory_time": float(self.refractory_time[i]),
+                "output_scaling": float(self.output_scaling[i]),
+                "burst_count": int(self.burst_count[i]),
+                "adaptation_current": float(self.adaptation_current[i]),
+            }
+            for i in range(self.num_neurons)
+        ]
+
+    def batched(self, batch_size, plastic=False):
+        """Copy the population into ``batch_size`` independent trials sharing parameters and topology.
+
+        State arrays gain a leading trial axis. With ``plastic`` (or when the
+        population already has plasticity) every trial learns on its own copy
+        of the recurrent weights, held together by ``TraceSTDP.batched`` so
+        that one update covers all trials.
+        """
+        if self.delays is not None:
+            raise ValueError("Populations with synaptic delays cannot be batched")
+        self.materialize()
+        batch = copy.copy(self)
+        batch._event_driven = False
+        for name in self.state_fields:
+            setattr(batch, name, np.repeat(getattr(self, name)[None], batch_size, axis=0))
+        batch._external_history = self._external_history.repeat(batch_size)
+        batch._recurrent_history = self._recurrent_history.repeat(batch_size)
+        batch.batch_size = batch_size
+        if plastic or self.plasticity is not None:
+            if self.plasticity is None:
+                weights = self.recurrent_connectivity
+                mask = None if isinstance(weights, SparseConnectivity) else weights != 0
+                template = TraceSTDP(weights, mask=mask)
+            else:
+                template = self.plasticity
+            batch.plasticity = template.batched(batch_size)
+        return batch
+
+    def partition(self, start, stop):
+        """Neurons ``start:stop`` as a population of their own.
+
+        The partition keeps the full input layout (every external input and
+        the whole recurrent drive vector) but only its rows of the
+        connectivity, parameters and state. Rows are views into this
+        population; the sensory input history is copied.
+        """
+        if self.batch_size is not None:
+            raise ValueError("Batched populations cannot be partitioned")
+        if self.delays is not None:
+            raise ValueError("Populations with synaptic delays cannot be partitioned")
+        part = copy.copy(self)
+        part.__dict__.pop("_kinds", None)
+        for name in self.state_fields + self.parameter_fields:
+            setattr(part, name, getattr(self, name)[start:stop])
+        part.num_neurons = stop - start
+        part.external_connectivity = self.external_connectivity[start:stop]
+        if isinstance(self.recurrent_connectivity, SparseConnectivity):
+            part.recurrent_connectivity = self.recurrent_connectivity.row_slice(start, stop)
+        else:
+            part.recurrent_connectivity = self.recurrent_connectivity[start:stop]
+        part.sensory_index = np.flatnonzero(part.neuron_types == "sensory")
+        part.interneuron_index = np.flatnonzero(part.neuron_types == "interneuron")
+        part._external_history = copy.deepcopy(self._external_history)
+        part._recurrent_history = copy.deepcopy(self._recurrent_history)
+        if self.plasticity is not None:
+            part.plasticity = self.plasticity.row_slice(start, stop, part.recurrent_connectivity)
+        return part
+
+    def recurrent_drive(self, previous_outputs):
+        if previous_outputs.ndim > 1:
+            if self.plasticity is None:
+                return (self.recurrent_connectivity @ previous_outputs.T).T
+            weights = self.plasticity.weights  # One set per trial
+            if isinstance(weights, SparseConnectivity):
+                # One pass per trial: a single pass over all trials scatters its reads once nnz outgrows the cache.
+                return np.stack([weights.dot(outputs, data) for data, outputs in zip(weights.data, previous_outputs)])
+            return (weights @ previous_outputs[..., None])[..., 0]
+        if self.delays is not None:
+            return self.delays.deliver(previous_outputs)
+        if self._event_driven:
+            active = np.flatnonzero(previous_outputs)
+            weights = self.recurrent_connectivity
+            if isinstance(weights, SparseConnectivity):
+                return weights.dot_active(previous_outputs, active)
+            if active.size < 0.2 * weights.shape[1]:
+                return weights[:, active] @ previous_outputs[active]
+        return self.recurrent_connectivity @ previous_outputs
+
+    def step(self, inputs, previous_outputs=None):
+        if previous_outputs is None:
+            previous_outputs = np.zeros(self.spike.shape[:-1] + (self.recurrent_connectivity.shape[1],))
+        previous_outputs = np.asarray(previous_outputs, dtype=float)
+        current_time = self.step_count * self.time_step
+        outputs = self.advance(inputs, self.recurrent_drive(previous_outputs))
+        if self.plasticity is not None:
+            self.plasticity.step(current_time, previous_outputs, self.spike)
+        return outputs
+
+    def advance(self, inputs, recurrent_inputs):
+        inputs = np.asarray(inputs, dtype=float)
+        recurrent_inputs = np.asarray(recurrent_inputs, dtype=float)
+        self.step_count += 1
+        if self._event_driven:
+            return self._advance_events(inputs, recurrent_inputs)
+        if self.kernel is not None:
+            return self._advance_kernel(inputs, recurrent_inputs)
+        self._adapt_inputs(inputs, recurrent_inputs)
+        np.maximum(self.refractory_time - self.time_step, 0.0, out=self.refractory_time)
+        self.adaptation_current *= self.adaptation_factor
+        fired = (self.refractory_time <= 0) & (self.membrane_potential >= self.threshold)
+
+        np.copyto(self.membrane_potential, self.reset_potential, where=fired)
+        np.copyto(self.refractory_time, self.refractory_period, where=fired)
+        np.add(self.adaptation_current, self.adaptation_strength, out=self.adaptation_current, where=fired)
+        bursting = fired & self.is_pyramidal & (self.burst_count < self.max_bursts)
+        self.burst_count += bursting
+        np.copyto(self.refractory_time, self.refractory_period / 2, where=bursting)
+        self.burst_count *= fired
+        self.spike[...] = fired
+
+        outputs = np.where(fired, self.output_scaling, 0.0)
+        return np.where(self.is_excitatory, outputs, -outputs)
+
+    def _advance_events(self, inputs, recurrent_inputs):
+        self._adapt_inputs(inputs, recurrent_inputs)
+        # Only neurons that fired on the previous step can hold a spike or a burst count to clear.
+        previous = np.flatnonzero(self.spike)
+        self.spike[previous] = 0
+        candidates = np.flatnonzero(self.membrane_potential >= self.threshold)
+        self.materialize(candidates)
+        fired = candidates[self.refractory_time[candidates] <= 0]
+
+        self.membrane_potential[fired] = self.reset_potential[fired]
+        self.refractory_time[fired] = self.refractory_period[fired]
+        self.adaptation_current[fired] += self.adaptation_strength[fired]
+        bursting = fired[self.is_pyramidal[fired] & (self.burst_count[fired] < self.max_bursts[fired])]
+        self.burst_count[bursting] += 1
+        self.refractory_time[bursting] = self.refractory_period[bursting] / 2
+        self.spike[fired] = 1
+        self.burst_count[previous[self.spike[previous] == 0]] = 0
+
+        outputs = np.zeros(self.num_neurons)
+        outputs[fired] = np.where(self.is_excitatory[fired], self.output_scaling[fired], -self.output_scaling[fired])
+        return outputs
+
+    def _adapt_inputs(self, inputs, recurrent_inputs):
+        # Input-dependent rules: sensory thresholds follow the input variance, interneurons the input mean.
+        if self.sensory_index.size:
+            variance = self._sensory_variance(inputs, recurrent_inputs)
+            if variance is not None:
+                index = self.sensory_index
+                threshold = self.threshold[..., index]
+                self.threshold[..., index] = np.where(
+                    variance > 0.5,
+                    np.maximum(-70.0, threshold - 2.0),
+                    np.minimum(threshold + 2.0, self.base_threshold[index] + 10.0),
+                )
+        if self.interneuron_index.size:
+            self.is_excitatory[..., self.interneuron_index] = ~(self._interneuron_mean(inputs, recurrent_inputs) > 0.5)
+
+    def _advance_kernel(self, inputs, recurrent_inputs):
+        if not hasattr(self, "_kinds"):
+            self._kinds = neuron_kinds(self.neuron_types)
+        num_external = self.external_connectivity.shape[1]
+        inputs = np.broadcast_to(inputs, self.spike.shape[:-1] + (num_external,)).reshape(-1, num_external)
+        recurrent_sum = recurrent_inputs.sum(axis=-1).reshape(-1)
+        input_variance = np.zeros((len(inputs), num_external))
+        recurrent_variance = np.zeros(len(inputs))
+        adapt_threshold = False
+        if self.sensory_index.size:
+            self._external_history.append(inputs.reshape(self.spike.shape[:-1] + (num_external,)))
+            self._recurrent_history.append(recurrent_inputs)
+            adapt_threshold = len(self._external_history) > 1
+            input_variance = self._external_history.variance().reshape(-1, num_external)
+            recurrent_variance = self._recurrent_history.variance().sum(axis=-1).reshape(-1)
+        outputs = np.empty(self.spike.shape)
+        # State arrays are C-contiguous, so the flattened views write through.
+        self.kernel(
+            self._kinds, self.external_connectivity, inputs, recurrent_sum, input_variance, recurrent_variance,
+            self.num_inputs, adapt_threshold, self.time_step, self.membrane_potential.reshape(-1),
+            self.threshold.reshape(-1), self.base_threshold, self.refractory_time.reshape(-1), self.refractory_period,
+            self.adaptation_current.reshape(-1), self.adaptation_factor, self.adaptation_strength,
+            self.reset_potential, self.burst_count.reshape(-1), self.max_bursts, self.is_excitatory.reshape(-1),
+            self.output_scaling, self.spike.reshape(-1), outputs.reshape(-1),
+        )
+        return outputs
+
+    def _interneuron_mean(self, inputs, recurrent_inputs):
+        external = inputs @ self.external_connectivity[self.interneuron_index].T
+        return (external + recurrent_inputs.sum(axis=-1, keepdims=True)) / self.num_inputs
+
+    def _sensory_variance(self, inputs, recurrent_inputs):
+        # Mean input variance of every sensory neuron, or None until two steps are in the window.
+        self._external_history.append(inputs)
+        self._recurrent_history.append(recurrent_inputs)
+        if len(self._external_history) <= 1:
+            return None
+        # var(w * u) == w**2 * var(u), so the per-neuron input windows are never built.
+        weights_squared = self.external_connectivity[self.sensory_index] ** 2
+        variance_sum = self._external_history.variance() @ weights_squared.T
+        variance_sum += self._recurrent_history.variance().sum(axis=-1)[..., None]
+        return variance_sum / self.num_inputs
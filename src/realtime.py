@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Step time histogram edges in seconds; the last bin collects everything slower.
+STEP_TIME_EDGES = np.array([0.0, 1e-4, 2e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 1e-1, np.inf])
+# Event loop timers wake up with about a millisecond of slack, so the last stretch is spent yielding.
+SPIN_TIME = 1e-3
+
+
+async def sleep_until(deadline, spin_time=SPIN_TIME):
+    """Sleep until ``time.perf_counter()`` reaches ``deadline``, more precisely than ``asyncio.sleep``.
+
+    The last ``spin_time`` seconds are spent yielding to the event loop in a
+    busy loop; with 0 this is a plain ``asyncio.sleep`` and may wake late.
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > spin_time:
+        await asyncio.sleep(remaining - spin_time)
+    if spin_time > 0:
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0)
+
+
+class LagStats:
+    """Timing of a real-time run.
+
+    ``step_times`` is a histogram of ``network.forward`` durations over
+    ``bin_edges`` (seconds). A step is late when it finished after its
+    deadline, the end of its period; ``max_lag`` is the longest delay of a
+    step start behind its tick. ``late_inputs`` counts steps that found no
+    new input and reused the previous one. ``dropped_inputs`` and
+    ``dropped_outputs`` count inputs discarded on a full input buffer and
+    outputs discarded on a full subscriber queue.
+    """
+
+    def __init__(self, bin_edges=STEP_TIME_EDGES):
+        self.bin_edges = bin_edges
+        self.step_times = np.zeros(len(bin_edges) - 1, dtype=np.int64)
+        self.steps = 0
+        self.late_steps = 0
+        self.late_inputs = 0
+        self.dropped_inputs = 0
+        self.dropped_outputs = 0
+        self.max_lag = 0.0
+        self.total_step_time = 0.0
+
+    def record_step(self, duration, lag, late):
+        self.step_times[np.searchsorted(self.bin_edges, duration, side="right") - 1] += 1
+        self.steps += 1
+        self.total_step_time += duration
+        self.max_lag = max(self.max_lag, lag)
+        self.late_steps += late
+
+    def as_dict(self):
+        return {
+            "steps": self.steps,
+            "late_steps": self.late_steps,
+            "late_inputs": self.late_inputs,
+            "dropped_inputs": self.dropped_inputs,
+            "dropped_outputs": self.dropped_outputs,
+            "max_lag": self.max_lag,
+            "mean_step_time": self.total_step_time / self.steps if self.steps else 0.0,
+            "step_times": dict(zip(self.bin_edges[1:].tolist(), self.step_times.tolist())),
+        }
+
+
+class RealtimeRunner:
+    """Steps a network at a fixed wall-clock ``rate`` from a live input stream.
+
+    ``source`` is an async iterable or an ``asyncio.Queue`` of input vectors;
+    a queue ends with ``None``. A background task moves inputs into a buffer
+    of ``buffer_size``. When it is full, ``overflow="drop_oldest"`` discards
+    the oldest input (the network always sees the freshest data) and
+    ``overflow="block"`` stops reading the source until a step frees a slot,
+    passing back-pressure on to the producer.
+
+    Every tick consumes one buffered input, or reuses the previous one when
+    none has arrived. Outputs go to the queues returned by ``subscribe`` with
+    ``put_nowait``; a full subscriber loses its oldest item instead of
+    delaying the step. A step that overruns its period does not cause a
+    burst of catch-up steps unless ``catch_up`` is set. ``network.forward``
+    runs on the event loop, so other tasks only run between steps.
+
+    Each tick busy-waits for its last ``spin_time`` seconds, which keeps the
+    lag well under a millisecond at the cost of a core; 0 turns spinning off
+    and leaves the timing to the event loop's timer.
+    """
+
+    overflow_policies = ("drop_oldest", "block")
+
+    def __init__(self, network, source, rate=1000.0, buffer_size=16, overflow="drop_oldest", catch_up=False,
+                 spin_time=SPIN_TIME):
+        if overflow not in self.overflow_policies:
+            raise ValueError(f"Unknown overflow {overflow!r}; expected one of {self.overflow_policies}")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if spin_time < 0:
+            raise ValueError("spin_time must not be negative")
+        self.network = network
+        self.source = source
+        self.period = 1.0 / rate
+        self.buffer_size = buffer_size
+        self.overflow = overflow
+        self.catch_up = catch_up
+        self.spin_time = spin_time
+        self.stats = LagStats()
+        self.subscribers = []
+        self._stopped = False
+
+    def subscribe(self, maxsize=64):
+        """Queue receiving ``(step, outputs)`` after every step, and ``None`` when the run ends."""
+        queue = asyncio.Queue(maxsize)
+        self.subscribers.append(queue)
+        return queue
+
+    def stop(self):
+        """End the run after the current step."""
+        self._stopped = True
+
+    async def run(self, steps=None, previous_outputs=None):
+        """Step until the source is exhausted, ``steps`` steps ran or ``stop`` is called; returns the stats.
+
+        An exception raised by the source ends the run once the inputs it
+        buffered are used up and is re-raised here.
+        """
+        self._stopped = False
+        pending = asyncio.Queue(self.buffer_size)
+        exhausted = asyncio.Event()
+        producer = asyncio.create_task(self._produce(pending, exhausted))
+        outputs = np.zeros(self.network.num_neurons) if previous_outputs is None else previous_outputs
+        inputs = np.zeros(self.network.num_inputs_per_neuron)
+        step = 0
+        next_tick = time.perf_counter()
+        try:
+            while not self._stopped and (steps is None or step < steps):
+                await sleep_until(next_tick, self.spin_time)
+                await asyncio.sleep(0)  # Let the producer and subscribers run even when behind schedule
+                lag = time.perf_counter() - next_tick
+                if not pending.empty():
+                    inputs = pending.get_nowait()
+                elif exhausted.is_set():
+                    break
+                else:
+                    self.stats.late_inputs += 1
+                start = time.perf_counter()
+                outputs = self.network.forward(inputs, outputs)
+                now = time.perf_counter()
+                next_tick += self.period
+                self.stats.record_step(now - start, lag, now > next_tick)
+                self._publish((step, outputs))
+                step += 1
+                if not self.catch_up and now > next_tick:
+                    next_tick = now
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            self._publish(None)
+        if not producer.cancelled() and producer.exception() is not None:
+            raise producer.exception()
+        logger.debug("Real-time run ended after %d steps: %s", step, self.stats.as_dict())
+        return self.stats
+
+    async def _produce(self, pending, exhausted):
+        try:
+            async for inputs in self._read():
+                inputs = np.asarray(inputs, dtype=float)
+                if self.overflow == "block":
+                    await pending.put(inputs)
+                    continue
+                if pending.full():
+                    pending.get_nowait()
+                    self.stats.dropped_inputs += 1
+                pending.put_nowait(inputs)
+        finally:
+            exhausted.set()
+
+    async def _read(self):
+        if isinstance(self.source, asyncio.Queue):
+            while (inputs := await self.source.get()) is not None:
+                yield inputs
+        else:
+            async for inputs in self.source:
+                yield inputs
+
+    def _publish(self, item):
+        for queue in self.subscribers:
+            if queue.full() and queue.get_nowait() is not None:
+                self.stats.dropped_outputs += 1
+            queue.put_nowait(item)
+
+
+class FakeSensor:
+    """In-process stand-in for a live sensor: yields ``values`` one every ``1 / rate`` seconds."""
+
+    def __init__(self, values, rate=1000.0, spin_time=SPIN_TIME):
+        self.values = values
+        self.period = 1.0 / rate
+        self.spin_time = spin_time
+
+    async def __aiter__(self):
+        next_sample = time.perf_counter()
+        for value in self.values:
+            next_sample += self.period
+            await sleep_until(next_sample, self.spin_time)
+            yield value
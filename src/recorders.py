@@ -0,0 +1,343 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+from src.connectivity import SparseConnectivity
+
+SPIKE_EVENT = np.dtype([("step", np.int64), ("neuron", np.int32), ("sign", np.int8)])
+
+
+class ChunkedBuffer:
+    """Append-only row buffer backed by fixed-size chunks.
+
+    With a known ``capacity`` a single array is preallocated. Otherwise rows go
+    into chunks of ``chunk_size``; when a ``sink`` is given, every full chunk is
+    handed to ``sink(first_row, chunk)`` and dropped, so memory stays bounded.
+    """
+
+    def __init__(self, row_shape, dtype=float, chunk_size=1024, capacity=None, sink=None):
+        self.row_shape = tuple(row_shape)
+        self.dtype = dtype
+        self.chunk_size = capacity if capacity is not None and sink is None else chunk_size
+        self.sink = sink
+        self.chunks = []
+        self.rows_flushed = 0
+        self._fill = 0
+        self._chunk = None
+
+    def __len__(self):
+        return self.rows_flushed + sum(len(chunk) for chunk in self.chunks) + self._fill
+
+    def append(self, row):
+        if self._chunk is None:
+            self._chunk = np.empty((self.chunk_size,) + self.row_shape, dtype=self.dtype)
+            self._fill = 0
+        self._chunk[self._fill] = row
+        self._fill += 1
+        if self._fill == self.chunk_size:
+            self._retire(self._chunk)
+
+    def extend(self, rows):
+        """Append a block of rows, filling the current chunk before starting the next."""
+        start = 0
+        while start < len(rows):
+            if self._chunk is None:
+                self._chunk = np.empty((self.chunk_size,) + self.row_shape, dtype=self.dtype)
+                self._fill = 0
+            count = min(len(rows) - start, self.chunk_size - self._fill)
+            self._chunk[self._fill:self._fill + count] = rows[start:start + count]
+            self._fill += count
+            start += count
+            if self._fill == self.chunk_size:
+                self._retire(self._chunk)
+
+    def flush(self):
+        if self._chunk is not None and self._fill:
+            self._retire(self._chunk[:self._fill])
+
+    def to_array(self):
+        parts = list(self.chunks)
+        if self._chunk is not None and self._fill:
+            parts.append(self._chunk[:self._fill])
+        if not parts:
+            return np.empty((0,) + self.row_shape, dtype=self.dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def _retire(self, chunk):
+        if self.sink is not None:
+            self.sink(self.rows_flushed, chunk)
+            self.rows_flushed += len(chunk)
+        else:
+            self.chunks.append(chunk)
+        self._chunk = None
+        self._fill = 0
+
+
+class Recorder(ABC):
+    """Base class for ``NeuralNetwork.simulate_network`` recorders.
+
+    ``every`` samples one step in k, so row ``k`` of the result belongs to
+    step ``k * every`` of the run. ``chunk_size`` and ``sink`` are passed to the
+    underlying ``ChunkedBuffer``. Subclasses define ``row_shape`` and ``sample``.
+    """
+
+    dtype = float
+
+    def __init__(self, every=1, chunk_size=1024, sink=None):
+        if every < 1:
+            raise ValueError("every must be a positive number of steps")
+        self.every = every
+        self.chunk_size = chunk_size
+        self.sink = sink
+        self.buffer = None
+
+    def start(self, network, num_steps=None):
+        capacity = None if num_steps is None else -(-num_steps // self.every)
+        self.buffer = ChunkedBuffer(self.row_shape(network), self.dtype, self.chunk_size, capacity, self.sink)
+
+    def record(self, step, outputs, network):
+        if step % self.every == 0:
+            self.buffer.append(self.sample(outputs, network))
+
+    def finish(self):
+        self.buffer.flush()
+
+    def result(self):
+        return self.buffer.to_array()
+
+    def sampled_steps(self):
+        return np.arange(len(self.buffer)) * self.every
+
+    @abstractmethod
+    def row_shape(self, network):
+        """Shape of one sampled row."""
+
+    @abstractmethod
+    def sample(self, outputs, network):
+        """Row recorded for a sampled step."""
+
+
+class SpikeRecorder(Recorder):
+    """Spike raster: signed output of every neuron (or ``neurons``) per sampled step."""
+
+    dtype = np.float32
+
+    def __init__(self, neurons=None, **kwargs):
+        super().__init__(**kwargs)
+        self.neurons = neurons
+
+    def row_shape(self, network):
+        return (network.num_neurons if self.neurons is None else len(self.neurons),)
+
+    def sample(self, outputs, network):
+        return outputs if self.neurons is None else outputs[self.neurons]
+
+
+class PotentialRecorder(Recorder):
+    """Membrane potentials of every neuron (or ``neurons``) per sampled step."""
+
+    def __init__(self, neurons=None, **kwargs):
+        super().__init__(**kwargs)
+        self.neurons = neurons
+
+    def row_shape(self, network):
+        return (network.num_neurons if self.neurons is None else len(self.neurons),)
+
+    def sample(self, outputs, network):
+        potentials = network.membrane_potentials()
+        return potentials if self.neurons is None else potentials[self.neurons]
+
+
+class WeightRecorder(Recorder):
+    """Snapshots of the plastic weights every ``every`` steps.
+
+    The object backend records every neuron's input weights. Array backends
+    record the recurrent weights: the full matrix when dense, or only the CSR
+    ``data`` array when sparse, since its layout never changes during a run.
+    """
+
+    def __init__(self, every=100, **kwargs):
+        super().__init__(every=every, **kwargs)
+
+    def row_shape(self, network):
+        return np.shape(self._weights(network))
+
+    def sample(self, outputs, network):
+        return self._weights(network)
+
+    def _weights(self, network):
+        if network.population is None:
+            return np.stack([neuron.weights for neuron in network.neurons])
+        weights = network.recurrent_connectivity
+        return weights.data if isinstance(weights, SparseConnectivity) else weights
+
+
+class SpikeEventRecorder(Recorder):
+    """Spikes as ``(step, neuron, sign)`` events instead of a dense raster.
+
+    Memory grows with the number of spikes rather than steps times neurons.
+    With ``every`` only the spikes of every k-th step are kept; events keep
+    their step numbers. ``chunk_size`` counts events; with
+    ``sink=EventFileSink(path)`` full chunks are streamed to disk. ``result``
+    returns a ``SpikeEvents``.
+    """
+
+    dtype = SPIKE_EVENT
+
+    def __init__(self, neurons=None, **kwargs):
+        super().__init__(**kwargs)
+        self.neurons = None if neurons is None else np.asarray(neurons)
+        self.num_neurons = None
+        self.num_steps = 0
+
+    def start(self, network, num_steps=None):
+        # The number of events is unknown up front, so nothing is preallocated.
+        self.buffer = ChunkedBuffer((), self.dtype, self.chunk_size, None, self.sink)
+        self.num_neurons = network.num_neurons
+        self.num_steps = 0
+        if isinstance(self.sink, EventFileSink):
+            # num_steps stays unset until finish, so an interrupted run falls back to the last spike.
+            self.sink.write_metadata(self.num_neurons, self.every)
+
+    def record(self, step, outputs, network):
+        self.num_steps = step + 1
+        if step % self.every == 0:
+            events = self.sample(outputs, network)
+            events["step"] = step
+            self.buffer.extend(events)
+
+    def finish(self):
+        super().finish()
+        if isinstance(self.sink, EventFileSink):
+            self.sink.write_metadata(self.num_neurons, self.every, self.num_steps)
+
+    def result(self):
+        return SpikeEvents(self.buffer.to_array(), self.num_neurons, self.num_steps, self.every)
+
+    def row_shape(self, network):
+        return ()  # One event per row
+
+    def sample(self, outputs, network):
+        """Events of the neurons spiking in ``outputs``; ``record`` fills in their step."""
+        if self.neurons is None:
+            neurons = np.flatnonzero(outputs)
+        else:
+            neurons = self.neurons[np.flatnonzero(outputs[self.neurons])]
+        events = np.empty(neurons.size, dtype=self.dtype)
+        events["neuron"] = neurons
+        events["sign"] = np.sign(outputs[neurons])
+        return events
+
+
+class EventFileSink:
+    """Sink that appends every retired chunk of events to ``path`` as raw ``SPIKE_EVENT`` records.
+
+    The file is truncated on creation. ``SpikeEventRecorder`` also writes
+    ``num_neurons``, ``every`` and ``num_steps`` to the JSON sidecar
+    ``metadata_path`` (``path`` plus ``.json``), so ``SpikeEvents.from_file``
+    can read the file back from its path alone.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.metadata_path = _metadata_path(path)
+        open(path, "wb").close()
+        if os.path.exists(self.metadata_path):
+            os.remove(self.metadata_path)
+
+    def write_metadata(self, num_neurons, every=1, num_steps=None):
+        with open(self.metadata_path, "w") as file:
+            json.dump({"num_neurons": num_neurons, "every": every, "num_steps": num_steps}, file)
+
+    def __call__(self, first_row, chunk):
+        with open(self.path, "ab") as file:
+            file.write(np.ascontiguousarray(chunk, dtype=SPIKE_EVENT).tobytes())
+
+
+def _metadata_path(path):
+    return os.fspath(path) + ".json"
+
+
+class SpikeEvents:
+    """Spikes of a run as a ``SPIKE_EVENT`` array, sorted by step.
+
+    ``sign`` is +1 for excitatory and -1 for inhibitory output; the magnitude
+    is the neuron's ``output_scaling`` and is not stored. ``num_steps`` is the
+    length of the run and defaults to one past the last spike. Only steps
+    that are multiples of ``every`` were scanned for spikes, so rates are
+    taken over those sampled steps and the raster has one row per sampled
+    step, like ``SpikeRecorder(every=every)``.
+    """
+
+    def __init__(self, events, num_neurons, num_steps=None, every=1):
+        self.events = events
+        self.num_neurons = num_neurons
+        if num_steps is None:
+            num_steps = int(events["step"][-1]) + 1 if len(events) else 0
+        self.num_steps = num_steps
+        self.every = every
+
+    @classmethod
+    def from_file(cls, path, num_neurons=None, num_steps=None, every=None, mmap=True):
+        """Events written by an ``EventFileSink``; arguments left as None are read from its sidecar."""
+        metadata = {}
+        if os.path.exists(_metadata_path(path)):
+            with open(_metadata_path(path)) as file:
+                metadata = json.load(file)
+        num_neurons = metadata.get("num_neurons") if num_neurons is None else num_neurons
+        if num_neurons is None:
+            raise ValueError(f"{path} has no metadata sidecar; pass num_neurons")
+        num_steps = metadata.get("num_steps") if num_steps is None else num_steps
+        every = metadata.get("every", 1) if every is None else every
+        if mmap and os.path.getsize(path):
+            events = np.memmap(path, dtype=SPIKE_EVENT, mode="r")
+        else:
+            events = np.fromfile(path, dtype=SPIKE_EVENT)
+        return cls(events, num_neurons, num_steps, every)
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def steps(self):
+        return self.events["step"]
+
+    @property
+    def neurons(self):
+        return self.events["neuron"]
+
+    @property
+    def signs(self):
+        return self.events["sign"]
+
+    @property
+    def num_sampled(self):
+        """Number of steps scanned for spikes."""
+        return -(-self.num_steps // self.every)
+
+    def counts(self):
+        """Number of spikes of every neuron."""
+        return np.bincount(self.neurons, minlength=self.num_neurons)
+
+    def rates(self, time_step=0.5):
+        """Mean firing rate of every neuron in Hz over the sampled steps, for ``time_step`` in ms."""
+        duration = self.num_sampled * time_step / 1000.0
+        return self.counts() / duration if duration else np.zeros(self.num_neurons)
+
+    def population_rate(self, bin_steps=1, time_step=0.5):
+        """Mean firing rate per neuron in Hz over consecutive bins of ``bin_steps`` steps.
+
+        Each bin is divided by the sampled steps it holds; bins without one read zero.
+        """
+        num_bins = -(-self.num_steps // bin_steps)
+        spikes = np.bincount(self.steps // bin_steps, minlength=num_bins)
+        starts = np.arange(num_bins + 1) * bin_steps
+        sampled = np.diff(-(-np.minimum(starts, self.num_steps) // self.every))
+        duration = self.num_neurons * sampled * time_step / 1000.0
+        return np.divide(spikes, duration, out=np.zeros(num_bins), where=sampled > 0)
+
+    def raster(self, dtype=np.int8):
+        """Dense ``(num_sampled, num_neurons)`` raster of spike signs, one row per sampled step."""
+        raster = np.zeros((self.num_sampled, self.num_neurons), dtype=dtype)
+        raster[self.steps // self.every, self.neurons] = self.signs
+        return raster
@@ -1,21 +1,35 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from src.live_plot import LivePlotRecorder
 from src.network import NeuralNetwork
+from src.recorders import PotentialRecorder, SpikeEventRecorder
 
-def visualize_network():
+def visualize_network(time_steps=40, live=False, path=None):
+    """Simulate a small network and plot its potentials and spike counts.
+
+    With ``live`` the figure is updated while the network runs, and with
+    ``path`` it is rendered headless to that file; both keep memory bounded,
+    so ``time_steps`` may be in the millions.
+    """
     np.random.seed(0)
     network = NeuralNetwork(num_neurons=10, num_inputs_per_neuron=5)
-    time_steps = 40
-    outputs = np.zeros(network.num_neurons)
-    potentials = np.zeros((time_steps, network.num_neurons))
-    spikes = np.zeros((time_steps, network.num_neurons))
-    
-    for t in range(time_steps):
+
+    def inputs(t):
         base_inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
-        inputs = base_inputs * (1 + 0.2 * np.sin(t * 0.5)) + np.random.randn(5) * 20.0
-        outputs = network.forward(inputs, outputs)
-        potentials[t] = [neuron.get_state()['membrane_potential'] for neuron in network.neurons]
-        spikes[t] = outputs
+        return base_inputs * (1 + 0.2 * np.sin(t * 0.5)) + np.random.randn(5) * 20.0
+
+    if live or path is not None:
+        recorder = LivePlotRecorder(path=path, refresh_every=max(1, min(1000, time_steps // 20)))
+        network.simulate_network(inputs, time_steps, recorders=[recorder])
+        if path is None:
+            plt.show()
+        return
+
+    potential_recorder = PotentialRecorder()
+    spike_recorder = SpikeEventRecorder()
+    network.simulate_network(inputs, time_steps, recorders=[potential_recorder, spike_recorder])
+    potentials = potential_recorder.result()
+    spikes = spike_recorder.result()
     
     # Plot membrane potentials
     plt.figure(figsize=(12, 6))
@@ -29,7 +43,7 @@ def visualize_network():
     plt.show()
     
     # Plot spike counts
-    spike_counts = np.sum(spikes != 0, axis=0)
+    spike_counts = spikes.counts()
     plt.figure(figsize=(12, 6))
     plt.bar(range(network.num_neurons), spike_counts, color='skyblue')
     plt.title("Spike Counts per Neuron")
@@ -1,55 +1,83 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from src.live_plot import LivePlot
 from src.neuron import GeneralizedNeuron
 
-# Simulate a pyramidal neuron
-neuron = GeneralizedNeuron(num_inputs=3, neuron_type="pyramidal", region="cortex", time_step=0.1)
-time_steps = 100
-inputs = [np.array([2.0, 2.0, 2.0]) for t in range(time_steps)]  # Sustained inputs
-membrane_potentials = []
-spikes = []
-adaptation_currents = []
-weights = []
-
-# Run simulation
-for t in range(time_steps):
-    output = neuron.forward(inputs[t])
-    membrane_potentials.append(neuron.membrane_potential)
-    spikes.append(output)
-    adaptation_currents.append(neuron.adaptation_current)
-    weights.append(neuron.weights[0])  # Track first weight
-
-# Plot results
-time = np.arange(0, time_steps * neuron.time_step, neuron.time_step)
-plt.figure(figsize=(10, 10))
-plt.subplot(4, 1, 1)
-plt.plot(time, membrane_potentials, label="Membrane Potential (mV)")
-plt.axhline(neuron.threshold, color='r', linestyle='--', label="Threshold")
-plt.title("Pyramidal Neuron: Membrane Potential")
-plt.xlabel("Time (ms)")
-plt.ylabel("Potential (mV)")
-plt.legend()
-
-plt.subplot(4, 1, 2)
-plt.stem(time, spikes, label="Spikes")
-plt.title("Spikes")
-plt.xlabel("Time (ms)")
-plt.ylabel("Spike (1 or 0)")
-plt.legend()
-
-plt.subplot(4, 1, 3)
-plt.plot(time, adaptation_currents, label="Adaptation Current (mA)")
-plt.title("Adaptation Current")
-plt.xlabel("Time (ms)")
-plt.ylabel("Current (mA)")
-plt.legend()
-
-plt.subplot(4, 1, 4)
-plt.plot(time, weights, label="Weight (Synapse 0)")
-plt.title("STDP Weight Changes")
-plt.xlabel("Time (ms)")
-plt.ylabel("Weight")
-plt.legend()
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+def visualize_neuron(time_steps=100, live=False, path=None, refresh_every=1000):
+    """Simulate a pyramidal neuron under sustained input and plot its state.
+
+    With ``live`` the figure is updated in place while the neuron runs, and
+    with ``path`` it is rendered headless to that file; both keep memory
+    bounded, so ``time_steps`` may be in the millions.
+    """
+    # Simulate a pyramidal neuron
+    neuron = GeneralizedNeuron(num_inputs=3, neuron_type="pyramidal", region="cortex", time_step=0.1)
+    inputs = np.array([2.0, 2.0, 2.0])  # Sustained inputs
+
+    if live or path is not None:
+        panels = [("Pyramidal Neuron: Membrane Potential", "Potential (mV)", ["Membrane Potential"]),
+                  ("Adaptation Current", "Current (mA)", ["Adaptation Current"]),
+                  ("STDP Weight Changes", "Weight", ["Weight (Synapse 0)"])]
+        plot = LivePlot(panels, num_neurons=1, time_step=neuron.time_step, headless=path is not None)
+        for t in range(time_steps):
+            output = neuron.forward(inputs)
+            plot.append([[neuron.membrane_potential], [neuron.adaptation_current], [neuron.weights[0]]], [output])
+            if (t + 1) % refresh_every == 0:
+                plot.redraw()
+        if path is not None:
+            plot.save(path)
+        else:
+            plot.redraw()
+            plt.show()
+        return
+
+    membrane_potentials = []
+    spikes = []
+    adaptation_currents = []
+    weights = []
+
+    # Run simulation
+    for t in range(time_steps):
+        output = neuron.forward(inputs)
+        membrane_potentials.append(neuron.membrane_potential)
+        spikes.append(output)
+        adaptation_currents.append(neuron.adaptation_current)
+        weights.append(neuron.weights[0])  # Track first weight
+
+    # Plot results
+    time = np.arange(time_steps) * neuron.time_step
+    plt.figure(figsize=(10, 10))
+    plt.subplot(4, 1, 1)
+    plt.plot(time, membrane_potentials, label="Membrane Potential (mV)")
+    plt.axhline(neuron.threshold, color='r', linestyle='--', label="Threshold")
+    plt.title("Pyramidal Neuron: Membrane Potential")
+    plt.xlabel("Time (ms)")
+    plt.ylabel("Potential (mV)")
+    plt.legend()
+
+    plt.subplot(4, 1, 2)
+    plt.stem(time, spikes, label="Spikes")
+    plt.title("Spikes")
+    plt.xlabel("Time (ms)")
+    plt.ylabel("Spike (1 or 0)")
+    plt.legend()
+
+    plt.subplot(4, 1, 3)
+    plt.plot(time, adaptation_currents, label="Adaptation Current (mA)")
+    plt.title("Adaptation Current")
+    plt.xlabel("Time (ms)")
+    plt.ylabel("Current (mA)")
+    plt.legend()
+
+    plt.subplot(4, 1, 4)
+    plt.plot(time, weights, label="Weight (Synapse 0)")
+    plt.title("STDP Weight Changes")
+    plt.xlabel("Time (ms)")
+    plt.ylabel("Weight")
+    plt.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    visualize_neuron()
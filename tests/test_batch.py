@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from src.network import NeuralNetwork
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"]
+
+class TestSimulateBatch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        base_inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0])
+        self.inputs = base_inputs + rng.standard_normal((4, 30, 5)) * np.array([0.5, 5.0, 50.0, 100.0])[:, None, None]
+
+    def run_sequential(self, network, inputs):
+        spikes, potentials = [], []
+        outputs = np.zeros(network.num_neurons)
+        for x in inputs:
+            outputs = network.forward(x, outputs)
+            spikes.append(outputs)
+            potentials.append(network.population.membrane_potential.copy())
+        return np.array(spikes), np.array(potentials)
+
+    def assert_batch_matches_sequential(self, make_network, plasticity=False):
+        spikes, potentials = make_network().simulate_batch(self.inputs, plasticity=plasticity)
+        self.assertEqual(spikes.shape, (4, 30, 10))
+        self.assertEqual(potentials.shape, (4, 30, 10))
+        for b in range(len(self.inputs)):
+            expected_spikes, expected_potentials = self.run_sequential(make_network(), self.inputs[b])
+            np.testing.assert_array_equal(spikes[b], expected_spikes)
+            np.testing.assert_array_equal(potentials[b], expected_potentials)
+
+    def test_matches_independent_networks(self):
+        self.assert_batch_matches_sequential(lambda: NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"))
+
+    def test_sparse_matches_independent_networks(self):
+        self.assert_batch_matches_sequential(
+            lambda: NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", connectivity="sparse", fan_in=4)
+        )
+
+    def test_per_trial_plasticity(self):
+        self.assert_batch_matches_sequential(
+            lambda: NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", plasticity="trace"), plasticity=True
+        )
+
+    def test_sparse_per_trial_plasticity(self):
+        self.assert_batch_matches_sequential(
+            lambda: NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", connectivity="sparse", fan_in=4,
+                                  plasticity="trace"), plasticity=True
+        )
+
+    def test_object_backend(self):
+        vectorized = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy").simulate_batch(self.inputs)
+        reference = NeuralNetwork(10, 5, NEURON_TYPES, backend="object").simulate_batch(self.inputs)
+        np.testing.assert_array_equal(reference[0], vectorized[0])
+
+    def test_network_state_untouched(self):
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", plasticity="trace")
+        weights = network.recurrent_connectivity.copy()
+        thresholds = network.population.threshold.copy()
+        network.simulate_batch(self.inputs)
+        np.testing.assert_array_equal(network.recurrent_connectivity, weights)
+        np.testing.assert_array_equal(network.population.threshold, thresholds)
+        self.assertEqual(network.population.step_count, 0)
+
+    def test_input_shape_validation(self):
+        network = NeuralNetwork(10, 5, backend="numpy")
+        with self.assertRaises(ValueError):
+            network.simulate_batch(np.zeros((30, 5)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+from src.buffers import RingBuffer, RunningWindow, TimeDecimator
+from src.neuron import GeneralizedNeuron
+
+class TestRingBuffer(unittest.TestCase):
+    def test_eviction_order(self):
+        buffer = RingBuffer(3, (2,))
+        for i in range(5):
+            buffer.append([i, -i])
+        self.assertEqual(len(buffer), 3)
+        np.testing.assert_array_equal(buffer.to_array()[:, 0], [2, 3, 4])
+        np.testing.assert_array_equal(buffer.oldest(), [2, -2])
+        buffer.clear()
+        self.assertEqual(len(buffer.to_array()), 0)
+
+    def test_partial_fill(self):
+        buffer = RingBuffer(4, dtype=bool)
+        buffer.append(True)
+        buffer.append(False)
+        np.testing.assert_array_equal(buffer.to_array(), [True, False])
+
+class TestRunningWindow(unittest.TestCase):
+    def test_variance_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        rows = rng.standard_normal((50, 4)) * 100.0
+        window = RunningWindow(5, (4,))
+        for t, row in enumerate(rows):
+            window.append(row)
+            expected = np.var(rows[max(0, t - 4):t + 1], axis=0)
+            np.testing.assert_allclose(window.variance(), expected, rtol=1e-9, atol=1e-9)
+
+    def test_repeat_keeps_trials_independent(self):
+        window = RunningWindow(3, (2,))
+        window.append([1.0, 2.0])
+        batch = window.repeat(2)
+        batch.append([[3.0, 2.0], [1.0, 2.0]])
+        np.testing.assert_allclose(batch.variance(), [[1.0, 0.0], [0.0, 0.0]])
+        np.testing.assert_allclose(window.variance(), [0.0, 0.0])
+
+class TestNeuronHistories(unittest.TestCase):
+    def test_spike_times_stay_in_window(self):
+        np.random.seed(0)
+        neuron = GeneralizedNeuron(3, "sensory")
+        for _ in range(100):
+            neuron.membrane_potential = 0.0
+            neuron.forward([1.0, 0.0, 1.0])
+        current_time = (neuron.step_count - 1) * neuron.time_step
+        self.assertEqual(len(neuron.pre_spike_times[0]), 40)
+        self.assertEqual(neuron.pre_spike_times[1], [])
+        self.assertTrue(all(current_time - t <= neuron.stdp_window for t in neuron.post_spike_times))
+        self.assertEqual(len(neuron.input_history), neuron.max_history)
+
+class TestTimeDecimator(unittest.TestCase):
+    def test_memory_stays_bounded(self):
+        rng = np.random.default_rng(0)
+        rows = rng.standard_normal((1000, 3))
+        lows, highs = TimeDecimator(8, (3,), np.minimum), TimeDecimator(8, (3,), np.maximum)
+        for row in rows:
+            lows.append(row)
+            highs.append(row)
+        self.assertEqual(lows.data.shape, (8, 3))
+        self.assertEqual(lows.width, 128)
+        starts = lows.bucket_starts()
+        np.testing.assert_array_equal(starts, np.arange(8) * 128)
+        for start, low, high in zip(starts, lows.to_array(), highs.to_array()):
+            np.testing.assert_array_equal(low, rows[start:start + 128].min(axis=0))
+            np.testing.assert_array_equal(high, rows[start:start + 128].max(axis=0))
+
+    def test_counts_keep_every_spike(self):
+        spikes = np.zeros((100, 2), dtype=np.int64)
+        spikes[37, 1] = 1
+        counts = TimeDecimator(4, (2,), np.add, dtype=np.int64)
+        for row in spikes:
+            counts.append(row)
+        self.assertEqual(counts.steps, 100)
+        self.assertEqual(len(counts), 4)
+        np.testing.assert_array_equal(counts.to_array().sum(axis=0), [0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
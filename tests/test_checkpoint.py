@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.network import NeuralNetwork
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"]
+
+def run(network, steps, outputs):
+    # Inputs and potential kicks come from the global RNG, which the checkpoint also restores.
+    spikes = []
+    for _ in range(steps):
+        inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + np.random.randn(5) * 100.0
+        potentials = np.random.uniform(-75.0, -40.0, network.num_neurons)
+        if network.population is not None:
+            network.population.membrane_potential[:] = potentials
+        else:
+            for neuron, potential in zip(network.neurons, potentials):
+                neuron.membrane_potential = potential
+        outputs = network.forward(inputs, outputs)
+        spikes.append(outputs)
+    return np.array(spikes), outputs
+
+def weights(network):
+    if network.neurons is not None and network.population is None:
+        return np.stack([neuron.weights for neuron in network.neurons])
+    recurrent = network.recurrent_connectivity
+    return recurrent if isinstance(recurrent, np.ndarray) else recurrent.data
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_resume_is_bit_for_bit(self):
+        for options in ({"backend": "object"},
+                        {"backend": "numpy", "plasticity": "trace"},
+                        {"backend": "numpy", "connectivity": "sparse", "fan_in": 4, "plasticity": "trace"},
+                        {"backend": "numpy", "delays": np.arange(100).reshape(10, 10) % 4 + 1},
+                        {"backend": "numpy", "connectivity": "sparse", "fan_in": 4, "delays": 3,
+                         "event_driven": True}):
+            network = NeuralNetwork(10, 5, NEURON_TYPES, **options)
+            np.random.seed(3)
+            _, outputs = run(network, 20, np.zeros(10))
+            save_checkpoint(network, self.path)
+            expected, _ = run(network, 30, outputs)
+            restored = load_checkpoint(self.path, mmap_threshold=0)
+            resumed, _ = run(restored, 30, outputs)
+            np.testing.assert_array_equal(resumed, expected)
+            np.testing.assert_array_equal(weights(restored), weights(network))
+            self.assertEqual(restored.get_state(), network.get_state())
+
+    def test_weights_are_memory_mapped(self):
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", connectivity="sparse", fan_in=4,
+                                plasticity="trace")
+        save_checkpoint(network, self.path)
+        saved = np.load(os.path.join(self.path, "network.population.recurrent_connectivity.data.npy"))
+        restored = load_checkpoint(self.path, mmap_threshold=0)
+        recurrent = restored.recurrent_connectivity
+        self.assertIsInstance(recurrent.data, np.memmap)
+        self.assertIs(restored.population.recurrent_connectivity, recurrent)
+        self.assertIs(restored.population.plasticity.weights, recurrent)
+        np.random.seed(0)
+        run(restored, 20, np.zeros(10))
+        # Copy-on-write: learning does not touch the checkpoint on disk.
+        self.assertFalse(np.array_equal(recurrent.data, saved))
+        np.testing.assert_array_equal(
+            np.load(os.path.join(self.path, "network.population.recurrent_connectivity.data.npy")), saved
+        )
+        eager = load_checkpoint(self.path, mmap_mode=None)
+        self.assertNotIsInstance(eager.recurrent_connectivity.data, np.memmap)
+
+    def test_unsupported(self):
+        with self.assertRaises(TypeError):
+            save_checkpoint(object(), self.path)
+
+if __name__ == '__main__':
+    unittest.main()
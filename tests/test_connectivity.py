@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from src.connectivity import SparseConnectivity
+from src.network import NeuralNetwork
+
+class TestSparseConnectivity(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+
+    def test_dot_matches_dense(self):
+        dense = self.rng.random((6, 8)) * (self.rng.random((6, 8)) < 0.4)
+        dense[2] = 0.0  # Empty row in the middle
+        dense[5] = 0.0  # Empty trailing row
+        sparse = SparseConnectivity.from_dense(dense)
+        vector = self.rng.standard_normal(8)
+        np.testing.assert_allclose(sparse @ vector, dense @ vector)
+        np.testing.assert_array_equal(sparse.toarray(), dense)
+        np.testing.assert_allclose(sparse.row_norms(), np.linalg.norm(dense, axis=1))
+
+    def test_fixed_fan_in(self):
+        sparse = SparseConnectivity.random(50, 50, fan_in=10, rng=self.rng, exclude_diagonal=True)
+        self.assertEqual(sparse.nnz, 500)
+        self.assertTrue(np.all(np.diff(sparse.indptr) == 10))
+        for i in range(50):
+            row = sparse.indices[sparse.indptr[i]:sparse.indptr[i + 1]]
+            self.assertEqual(len(np.unique(row)), 10, "Presynaptic partners should be distinct")
+            self.assertNotIn(i, row, "No self-connections")
+
+    def test_connection_probability(self):
+        sparse = SparseConnectivity.random(400, 400, connection_prob=0.05, rng=self.rng)
+        self.assertAlmostEqual(sparse.nnz / (400 * 400), 0.05, delta=0.01)
+
+    def test_fan_in_validation(self):
+        with self.assertRaises(ValueError):
+            SparseConnectivity.random(5, 5, fan_in=5, exclude_diagonal=True)
+        with self.assertRaises(ValueError):
+            SparseConnectivity.random(5, 5)
+
+class TestSparseNetwork(unittest.TestCase):
+    def test_sparse_network(self):
+        network = NeuralNetwork(200, 5, backend="numpy", connectivity="sparse", fan_in=20)
+        self.assertIsNone(network.neurons)
+        self.assertEqual(network.recurrent_connectivity.shape, (200, 200))
+        self.assertEqual(network.recurrent_connectivity.nnz, 200 * 20)
+        norms = network.recurrent_connectivity.row_norms()
+        np.testing.assert_allclose(norms[network.population.is_excitatory], 80.0)
+        outputs = np.zeros(200)
+        for t in range(10):
+            outputs = network.forward(np.array([100.0, 50.0, -20.0, 80.0, 30.0]), outputs)
+        self.assertEqual(outputs.shape, (200,))
+        self.assertEqual(len(network.get_state()), 200)
+
+    def test_sparse_matches_dense_drive(self):
+        dense = NeuralNetwork(10, 5, backend="numpy")
+        sparse = NeuralNetwork(10, 5, backend="numpy")
+        sparse.population.recurrent_connectivity = SparseConnectivity.from_dense(dense.recurrent_connectivity)
+        rng = np.random.default_rng(11)
+        dense_outputs = np.zeros(10)
+        sparse_outputs = np.zeros(10)
+        for t in range(40):
+            inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal(5) * 100.0
+            dense_outputs = dense.forward(inputs, dense_outputs)
+            sparse_outputs = sparse.forward(inputs, sparse_outputs)
+            np.testing.assert_array_equal(sparse_outputs, dense_outputs)
+
+    def test_sparse_requires_array_backend(self):
+        with self.assertRaises(ValueError):
+            NeuralNetwork(10, 5, connectivity="sparse", fan_in=3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from src.connectivity import SparseConnectivity
+from src.delays import SynapticDelays
+from src.network import NeuralNetwork
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"] * 2
+
+def raster(network, inputs):
+    # Potentials are reset to random values each step so that neurons actually fire.
+    rng = np.random.default_rng(1)
+    outputs = np.zeros(network.num_neurons)
+    spikes = []
+    for x in inputs:
+        network.population.membrane_potential[:] = rng.uniform(-75.0, -40.0, network.num_neurons)
+        outputs = network.forward(x, outputs)
+        spikes.append(outputs)
+    return np.array(spikes)
+
+class TestSynapticDelays(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal((40, 5)) * 100.0
+
+    def test_matches_delayed_product(self):
+        rng = np.random.default_rng(2)
+        dense = rng.random((6, 8)) * (rng.random((6, 8)) < 0.6)
+        dense_delays = rng.integers(1, 5, size=dense.shape)
+        sparse = SparseConnectivity.from_dense(dense)
+        outputs = (rng.random((30, 8)) < 0.3) * rng.choice([-2.0, 1.0], size=(30, 8))
+        for weights, delays in ((dense, dense_delays), (sparse, dense_delays[np.nonzero(dense)])):
+            queue = SynapticDelays(weights, delays)
+            self.assertEqual(queue.max_delay, dense_delays.max())
+            history = [np.zeros(8)] * queue.max_delay
+            for previous in outputs:
+                history = [previous] + history[:-1]  # history[d - 1] was emitted d steps before arrival
+                expected = sum(((dense_delays == d) * dense) @ history[d - 1] for d in range(1, queue.max_delay + 1))
+                np.testing.assert_allclose(queue.deliver(previous), expected)
+
+    def test_unit_delay_matches_undelayed_network(self):
+        for options in ({}, {"plasticity": "trace"}, {"connectivity": "sparse", "fan_in": 6, "event_driven": True}):
+            expected = raster(NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", **options), self.inputs)
+            network = NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", delays=1, **options)
+            np.testing.assert_array_equal(raster(network, self.inputs), expected)
+
+    def test_delays_change_the_dynamics(self):
+        expected = raster(NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy"), self.inputs)
+        network = NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", delays=4)
+        self.assertFalse(np.array_equal(raster(network, self.inputs), expected))
+        network.population.delays.clear()
+        np.testing.assert_array_equal(network.population.delays.pending, 0.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            NeuralNetwork(20, 5, NEURON_TYPES, delays=2)
+        with self.assertRaises(ValueError):
+            NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", delays=0)
+        network = NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", delays=2)
+        with self.assertRaises(ValueError):
+            network.simulate_batch(self.inputs[None])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import contextlib
+import io
+import unittest
+import numpy as np
+from src.diagnostics import TRACE, disable_diagnostics, enable_diagnostics
+from src.network import NeuralNetwork
+
+class TestDiagnostics(unittest.TestCase):
+    def test_quiet_by_default(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            network = NeuralNetwork(10, 5)
+            network.forward(np.array([100.0, 50.0, -20.0, 80.0, 30.0]))
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_trace_lines(self):
+        for backend in ("object", "numpy"):
+            network = NeuralNetwork(10, 5, backend=backend)
+            stream = io.StringIO()
+            handler = enable_diagnostics(TRACE, stream=stream)
+            try:
+                outputs = network.forward(np.array([100.0, 50.0, -20.0, 80.0, 30.0]))
+            finally:
+                disable_diagnostics(handler)
+            lines = stream.getvalue().splitlines()
+            self.assertEqual(len(lines), 10)
+            self.assertIn("Neuron 6: Current=", lines[6])
+            self.assertTrue(lines[6].endswith(f"Spike={outputs[6]}"))
+
+    def test_membrane_potentials(self):
+        network = NeuralNetwork(10, 5)
+        network.forward(np.array([100.0, 50.0, -20.0, 80.0, 30.0]))
+        expected = [state["membrane_potential"] for state in network.get_state()]
+        np.testing.assert_array_equal(network.membrane_potentials(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
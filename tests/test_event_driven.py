@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+from src import kernels
+from src.network import NeuralNetwork
+from src.population import NeuronPopulation
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"] * 3
+
+def raster(network, inputs, kick_fraction=0.3):
+    # A random fraction of potentials is reset each step, since inputs alone rarely reach threshold.
+    rng = np.random.default_rng(1)
+    outputs = np.zeros(network.num_neurons)
+    spikes = []
+    for x in inputs:
+        kicked = rng.random(network.num_neurons) < kick_fraction
+        network.population.membrane_potential[kicked] = rng.uniform(-75.0, -40.0, kicked.sum())
+        outputs = network.forward(x, outputs)
+        spikes.append(outputs)
+    return np.array(spikes)
+
+class TestEventDriven(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal((80, 5)) * 100.0
+
+    def test_matches_fixed_step(self):
+        for options in ({}, {"plasticity": "trace"}, {"connectivity": "sparse", "fan_in": 6},
+                        {"connectivity": "sparse", "fan_in": 6, "plasticity": "trace"}):
+            for kick_fraction in (0.05, 0.5):
+                fixed = NeuralNetwork(30, 5, NEURON_TYPES, backend="numpy", **options)
+                network = NeuralNetwork(30, 5, NEURON_TYPES, backend="numpy", event_driven=True, **options)
+                expected = raster(fixed, self.inputs, kick_fraction)
+                self.assertTrue(np.any(expected))
+                np.testing.assert_array_equal(raster(network, self.inputs, kick_fraction), expected)
+                for state, reference in zip(network.get_state(), fixed.get_state()):
+                    for key, value in reference.items():
+                        if isinstance(value, float):
+                            self.assertAlmostEqual(state[key], value)
+                        else:
+                            self.assertEqual(state[key], value)
+                np.testing.assert_allclose(network.population.recurrent_drive(expected[-1]),
+                                           fixed.population.recurrent_drive(expected[-1]))
+
+    def test_matches_fixed_step_with_non_dyadic_time_step(self):
+        # Neurons fire, sit below threshold while refractory, then cross it again
+        # on the step where 0.4 - 0.1 - 0.1 - 0.1 - 0.1 is still just above zero.
+        rng = np.random.default_rng(5)
+        external, recurrent = rng.random((30, 5)), rng.random((30, 30))
+        rasters = []
+        for event_driven in (False, True):
+            population = NeuronPopulation.from_types(NEURON_TYPES, external, recurrent, time_step=0.1)
+            population.refractory_period[:] = 0.4
+            population.max_bursts[:] = 0
+            population.event_driven = event_driven
+            spikes = []
+            for above in (True, False, False, False, True, True):
+                population.membrane_potential[:] = population.threshold + 20.0 if above else -100.0
+                spikes.append(population.step(np.zeros(5), np.zeros(30)))
+            rasters.append(np.array(spikes))
+        np.testing.assert_array_equal(np.any(rasters[0], axis=1), [True, False, False, False, False, True])
+        np.testing.assert_array_equal(rasters[1], rasters[0])
+
+    def test_state_is_materialized_lazily(self):
+        network = NeuralNetwork(30, 5, NEURON_TYPES, backend="numpy", event_driven=True)
+        population = network.population
+        population.membrane_potential[:] = population.threshold + 1.0
+        network.forward(self.inputs[0])
+        self.assertTrue(np.all(population.refractory_time > 0))
+        population.membrane_potential[:] = -100.0
+        for x in self.inputs[1:11]:
+            network.forward(x)
+        # Nothing crossed threshold, so no neuron was touched since the first step.
+        np.testing.assert_array_equal(population.last_update, 1)
+        self.assertTrue(np.all(population.refractory_time > 0))
+        population.event_driven = False
+        np.testing.assert_array_equal(population.last_update, 11)
+        np.testing.assert_array_equal(population.refractory_time, 0.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            NeuralNetwork(30, 5, NEURON_TYPES, event_driven=True)
+        network = NeuralNetwork(30, 5, NEURON_TYPES, backend="numpy")
+        with self.assertRaises(ValueError):
+            network.population.batched(2).event_driven = True
+        with self.assertRaises(ValueError):
+            NeuralNetwork(30, 5, NEURON_TYPES, backend="numba", event_driven=True)
+        network.population.kernel = getattr(kernels.neuron_step, "py_func", kernels.neuron_step)
+        with self.assertRaises(ValueError):
+            network.population.event_driven = True
+
+    def test_simulate_batch_from_event_driven_network(self):
+        batch = np.stack([self.inputs, self.inputs[::-1]])
+        network = NeuralNetwork(30, 5, NEURON_TYPES, backend="numpy", event_driven=True)
+        fixed = NeuralNetwork(30, 5, NEURON_TYPES, backend="numpy")
+        raster(network, self.inputs[:10])
+        raster(fixed, self.inputs[:10])
+        for result, reference in zip(network.simulate_batch(batch), fixed.simulate_batch(batch)):
+            np.testing.assert_array_equal(result, reference)
+        self.assertTrue(network.population.event_driven)
+
+if __name__ == '__main__':
+    unittest.main()
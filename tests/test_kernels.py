@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from src import kernels
+from src.network import NeuralNetwork
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"]
+
+def raster(network, inputs, kick=False):
+    # ``kick`` resets potentials to random values each step, since inputs alone rarely reach threshold.
+    rng = np.random.default_rng(1)
+    outputs = np.zeros(network.num_neurons)
+    spikes = []
+    for x in inputs:
+        if kick:
+            network.population.membrane_potential[:] = rng.uniform(-75.0, -40.0, network.num_neurons)
+        outputs = network.forward(x, outputs)
+        spikes.append(outputs)
+    return np.array(spikes)
+
+class TestNeuronKernel(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal((60, 5)) * 100.0
+
+    def test_python_kernel_matches_numpy(self):
+        # The undecorated kernel shares its logic with the compiled one and runs without Numba.
+        kernel = getattr(kernels.neuron_step, "py_func", kernels.neuron_step)
+        for options in ({}, {"connectivity": "sparse", "fan_in": 4}):
+            for kick in (False, True):
+                expected = raster(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", **options), self.inputs, kick)
+                network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", **options)
+                network.population.kernel = kernel
+                np.testing.assert_array_equal(raster(network, self.inputs, kick), expected)
+
+    def test_python_kernel_batched(self):
+        kernel = getattr(kernels.neuron_step, "py_func", kernels.neuron_step)
+        batch = np.stack([self.inputs, self.inputs[::-1], self.inputs * 0.5])
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy")
+        expected = network.simulate_batch(batch)
+        network.population.kernel = kernel
+        for result, reference in zip(network.simulate_batch(batch), expected):
+            np.testing.assert_array_equal(result, reference)
+
+    @unittest.skipUnless(kernels.HAVE_NUMBA, "numba is not installed")
+    def test_numba_backend_matches_numpy(self):
+        for options in ({}, {"plasticity": "trace"}, {"connectivity": "sparse", "fan_in": 4}):
+            expected = raster(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", **options), self.inputs, True)
+            network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numba", **options)
+            self.assertIs(network.population.kernel, kernels.neuron_step)
+            np.testing.assert_array_equal(raster(network, self.inputs, True), expected)
+        expected = raster(NeuralNetwork(20, 5, backend="numpy"), self.inputs, True)
+        np.testing.assert_array_equal(raster(NeuralNetwork(20, 5, backend="numba"), self.inputs, True), expected)
+
+    def test_fallback_without_numba(self):
+        have_numba = kernels.HAVE_NUMBA
+        kernels.HAVE_NUMBA = False
+        try:
+            with self.assertLogs("src.network", "WARNING"):
+                network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numba")
+        finally:
+            kernels.HAVE_NUMBA = have_numba
+        self.assertIsNone(network.population.kernel)
+        expected = raster(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"), self.inputs)
+        np.testing.assert_array_equal(raster(network, self.inputs), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.live_plot import LivePlot, LivePlotRecorder, min_max_lines
+from src.network import NeuralNetwork
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
+
+class TestMinMaxLines(unittest.TestCase):
+    def test_interleaves_envelope(self):
+        x, y = min_max_lines(np.array([0, 4]), np.array([[1.0], [2.0]]), np.array([[3.0], [5.0]]))
+        np.testing.assert_array_equal(x, [0, 0, 4, 4])
+        np.testing.assert_array_equal(y[:, 0], [1.0, 3.0, 2.0, 5.0])
+
+@unittest.skipUnless(matplotlib, "matplotlib is not installed")
+class TestLivePlot(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_updates_artists_in_place(self):
+        plot = LivePlot([("Trace", "mV", ["a", "b"])], num_neurons=50, raster_rows=10, buckets=16, headless=True)
+        line, image = plot.lines[0][0], plot.image
+        for t in range(1000):
+            spikes = np.zeros(50)
+            spikes[t % 50] = 1.0 if t == 500 else 0.0
+            plot.append([[np.sin(t), -(t == 700)]], spikes)
+            if t % 100 == 99:
+                plot.redraw()
+        self.assertIs(plot.lines[0][0], line)
+        self.assertIs(plot.image, image)
+        self.assertLessEqual(len(line.get_xdata()), 32)
+        # Single-step events survive decimation in both the traces and the raster.
+        self.assertEqual(min(plot.lines[0][1].get_ydata()), -1.0)
+        self.assertEqual(np.asarray(image.get_array()).sum(), 1)
+        path = os.path.join(self.path, "trace.png")
+        plot.save(path)
+        self.assertGreater(os.path.getsize(path), 0)
+
+    def test_recorder_sampled_steps(self):
+        recorder = LivePlotRecorder(neurons=[0, 6], headless=True, buckets=8, every=2)
+        NeuralNetwork(10, 5, backend="numpy").simulate_network(np.ones((100, 5)) * 50.0, recorders=[recorder])
+        lows = recorder.result().envelopes[0][0]
+        self.assertEqual(lows.steps, 50)
+        np.testing.assert_array_equal(recorder.sampled_steps(), lows.bucket_starts() * 2)
+        self.assertEqual(recorder.sampled_steps()[0], 0)
+
+    def test_recorder_renders_network_run(self):
+        path = os.path.join(self.path, "network.png")
+        recorder = LivePlotRecorder(neurons=[0, 6], refresh_every=50, path=path, buckets=32)
+        NeuralNetwork(10, 5, backend="numpy").simulate_network(np.ones((300, 5)) * 50.0, recorders=[recorder])
+        self.assertTrue(recorder.headless)
+        self.assertEqual(recorder.result().envelopes[0][0].steps, 300)
+        self.assertGreater(os.path.getsize(path), 0)
+
+    def test_recorder_sampled_steps(self):
+        recorder = LivePlotRecorder(neurons=[0, 6], headless=True, buckets=8, every=2)
+        NeuralNetwork(10, 5, backend="numpy").simulate_network(np.ones((100, 5)) * 50.0, recorders=[recorder])
+        lows = recorder.result().envelopes[0][0]
+        self.assertEqual(lows.steps, 50)
+        np.testing.assert_array_equal(recorder.sampled_steps(), lows.bucket_starts() * 2)
+        self.assertEqual(recorder.sampled_steps()[0], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,5 +34,45 @@ class TestNeuralNetwork(unittest.TestCase):
         self.assertTrue(spike_counts[3] > 5, "Neuron 3 should spike early")
         self.assertTrue(spike_counts[8] > 2, "Inhibitory neuron 8 should spike")
 
+class TestNetworkConstruction(unittest.TestCase):
+    def test_global_rng_untouched(self):
+        np.random.seed(1)
+        expected = np.random.rand(3)
+        np.random.seed(1)
+        NeuralNetwork(20, 5)
+        np.testing.assert_array_equal(np.random.rand(3), expected)
+
+    def test_caller_generator(self):
+        first = NeuralNetwork(20, 5, rng=np.random.default_rng(3))
+        second = NeuralNetwork(20, 5, rng=np.random.default_rng(3))
+        other = NeuralNetwork(20, 5, rng=np.random.default_rng(4))
+        np.testing.assert_array_equal(first.recurrent_connectivity, second.recurrent_connectivity)
+        np.testing.assert_array_equal(first.neurons[3].weights, second.neurons[3].weights)
+        self.assertFalse(np.array_equal(first.recurrent_connectivity, other.recurrent_connectivity))
+
+    def test_rows_normalized(self):
+        network = NeuralNetwork(20, 5, backend="numpy")
+        norms = np.linalg.norm(network.recurrent_connectivity, axis=1)
+        expected = np.where(network.population.is_excitatory, 80.0, 24.0)
+        np.testing.assert_allclose(norms, expected)
+        self.assertTrue(np.all(np.diag(network.recurrent_connectivity) == 0))
+
+    def test_lazy_neurons(self):
+        lazy = NeuralNetwork(20, 5, backend="numpy")
+        eager = NeuralNetwork(20, 5, backend="numpy", materialize_neurons=True)
+        reference = NeuralNetwork(20, 5, backend="object")
+        self.assertIsNone(lazy.neurons)
+        self.assertEqual(len(eager.neurons), 20)
+        np.testing.assert_array_equal(lazy.recurrent_connectivity, reference.recurrent_connectivity)
+        np.testing.assert_array_equal(eager.neurons[6].weights, reference.neurons[6].weights)
+        self.assertEqual(eager.neurons[6].threshold, -70.0)
+        outputs = [np.zeros(20)] * 3
+        for t in range(10):
+            inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + t
+            outputs = [network.forward(inputs, previous)
+                       for network, previous in zip((lazy, eager, reference), outputs)]
+            np.testing.assert_array_equal(outputs[0], outputs[2])
+            np.testing.assert_array_equal(outputs[1], outputs[2])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
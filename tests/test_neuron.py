@@ -114,5 +114,71 @@ class TestGeneralizedNeuron(unittest.TestCase):
         self.assertEqual(excitatory_output, 1.0)
         self.assertEqual(inhibitory_output, -1.0)
 
+    def test_shared_parameters(self):
+        """Test that neurons share one parameter set per type and region."""
+        first = GeneralizedNeuron(self.num_inputs, "purkinje", "cerebellum", self.time_step)
+        second = GeneralizedNeuron(self.num_inputs, "purkinje", "cerebellum", self.time_step)
+        self.assertIs(first.params, second.params)
+        self.assertFalse(hasattr(first, "__dict__"))
+        
+        # Overriding a constant must not leak into other neurons
+        first.refractory_period = 0.3
+        self.assertEqual(first.refractory_period, 0.3)
+        self.assertEqual(second.refractory_period, 0.15)
+        self.assertIsNot(first.params, second.params)
+    
+    def test_cached_step_constants(self):
+        """Test that decay factors and STDP tables are shared and follow parameter changes."""
+        first = GeneralizedNeuron(self.num_inputs, "pyramidal", "cortex", self.time_step)
+        second = GeneralizedNeuron(self.num_inputs, "pyramidal", "cortex", self.time_step)
+        self.assertIs(first.constants, second.constants)
+        self.assertEqual(first.constants.adaptation_factor, np.exp(-first.adaptation_decay * self.time_step))
+
+        first.adaptation_decay = 0.4
+        self.assertEqual(first.constants.adaptation_factor, np.exp(-0.4 * self.time_step))
+        self.assertEqual(second.constants.adaptation_factor, np.exp(-0.8 * self.time_step))
+        second.time_step = 0.25
+        self.assertEqual(second.constants.adaptation_factor, np.exp(-0.8 * 0.25))
+
+        constants = second.constants
+        lags = np.arange(-constants.offset, constants.offset + 1)
+        dt = lags * 0.25
+        expected = np.where((dt > 0) & (dt <= 20.0), 0.015 * np.exp(-dt / 20.0), 0.0)
+        expected -= np.where((dt < 0) & (dt >= -20.0), 0.012 * np.exp(dt / 20.0), 0.0)
+        np.testing.assert_array_equal(constants.stdp_kernel, expected)
+
+    def test_update_weights_matches_exp_kernel(self):
+        """Test the STDP lookup table against the pairwise exp kernel over many spikes."""
+        for time_step in (0.1, 0.5):
+            neuron = GeneralizedNeuron(20, "pyramidal", "cortex", time_step, weights=np.zeros(20))
+            rng = np.random.default_rng(3)
+            pre = rng.random((neuron.pre_spikes.capacity, 20)) < 0.05
+            post = rng.random(neuron.post_spikes.capacity) < 0.05
+            # A pair exactly one window apart; at time_step 0.1 the difference
+            # of their spike times rounds to 20.000000000000004.
+            pre[-1, 0] = post[0] = True
+            for row in pre:
+                neuron.pre_spikes.append(row)
+            for spike in post:
+                neuron.post_spikes.append(spike)
+            neuron.step_count = 203
+
+            pre_times = np.arange(neuron.step_count - len(pre), neuron.step_count) * time_step
+            post_times = np.arange(neuron.step_count - len(post), neuron.step_count)[post] * time_step
+            dt = post_times[:, None] - pre_times[None, :]
+            window = np.abs(dt) <= 20.0 * (1 + 1e-9)
+            kernel = np.where((dt > 0) & window, 0.015 * np.exp(-dt / 20.0), 0.0)
+            kernel -= np.where((dt < 0) & window, 0.012 * np.exp(dt / 20.0), 0.0)
+            neuron.update_weights(None)
+            np.testing.assert_allclose(neuron.weights, kernel.sum(axis=0) @ pre, rtol=0, atol=1e-14)
+
+    def test_dendritic_views(self):
+        """Test that proximal and distal weights are views of the weights."""
+        neuron = GeneralizedNeuron(10, "pyramidal", "cortex", self.time_step)
+        self.assertEqual(len(neuron.proximal_weights), 7)
+        self.assertEqual(len(neuron.distal_weights), 3)
+        neuron.distal_weights[0] = 0.42
+        self.assertEqual(neuron.weights[7], 0.42)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import signal
+import unittest
+import numpy as np
+from src import kernels
+from src.network import NeuralNetwork
+from src.parallel import ParallelNeuralNetwork
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"] * 2
+# Spawn is the default on macOS and Windows; workers then receive pickled partitions.
+START_METHODS = [method for method in ("fork", "spawn") if method in multiprocessing.get_all_start_methods()]
+
+def run(network, inputs, rng=None, outputs=None):
+    # Potentials are reset to random values each step so that neurons actually fire.
+    rng = np.random.default_rng(1) if rng is None else rng
+    outputs = np.zeros(network.num_neurons) if outputs is None else outputs
+    spikes = []
+    for x in inputs:
+        network.population.membrane_potential[:] = rng.uniform(-75.0, -40.0, network.num_neurons)
+        outputs = network.forward(x, outputs)
+        spikes.append(outputs)
+    return np.array(spikes)
+
+def weights(network):
+    recurrent = network.recurrent_connectivity
+    return recurrent if isinstance(recurrent, np.ndarray) else recurrent.data
+
+class TestParallelNeuralNetwork(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal((30, 5)) * 100.0
+
+    def test_matches_serial(self):
+        for start_method in START_METHODS:
+            for options in ({}, {"plasticity": "trace"},
+                            {"connectivity": "sparse", "fan_in": 6, "plasticity": "trace"}):
+                with self.subTest(start_method=start_method, **options):
+                    serial = NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", **options)
+                    expected = run(serial, self.inputs)
+                    with ParallelNeuralNetwork(20, 5, NEURON_TYPES, workers=3, start_method=start_method,
+                                               **options) as network:
+                        np.testing.assert_array_equal(run(network, self.inputs), expected)
+                        np.testing.assert_array_equal(network.membrane_potentials(), serial.membrane_potentials())
+                        np.testing.assert_array_equal(weights(network), weights(serial))
+                        self.assertEqual(network.get_state(), serial.get_state())
+
+    @unittest.skipUnless(kernels.HAVE_NUMBA, "numba is not installed")
+    def test_numba_matches_serial_small_drive(self):
+        # Small input noise keeps the sensory input variance near its cut-off, so each worker's
+        # kernel must normalise by the input count of the whole network, not of its partition.
+        neuron_types = ["interneuron", "sensory", "purkinje", "pyramidal"] * 25
+        inputs = np.random.default_rng(0).standard_normal((60, 5)) * 0.1 + 0.1
+        for start_method in START_METHODS:
+            with self.subTest(start_method=start_method):
+                serial = NeuralNetwork(100, 5, neuron_types, backend="numba")
+                with ParallelNeuralNetwork(100, 5, neuron_types, workers=4, backend="numba",
+                                           start_method=start_method) as network:
+                    expected = outputs = np.zeros(100)
+                    for x in inputs:
+                        expected = serial.forward(x, expected)
+                        outputs = network.forward(x, outputs)
+                        np.testing.assert_array_equal(outputs, expected)
+                        np.testing.assert_array_equal(network.population.threshold, serial.population.threshold)
+                        np.testing.assert_array_equal(network.population.is_excitatory,
+                                                      serial.population.is_excitatory)
+
+    def test_close_keeps_state(self):
+        serial = NeuralNetwork(20, 5, NEURON_TYPES, backend="numpy", plasticity="trace")
+        expected = run(serial, self.inputs)
+        rng = np.random.default_rng(1)
+        network = ParallelNeuralNetwork(20, 5, NEURON_TYPES, workers=2, plasticity="trace")
+        potentials = network.membrane_potentials()
+        before = run(network, self.inputs[:10], rng)
+        network.close()
+        network.close()
+        np.testing.assert_array_equal(potentials, network.membrane_potentials())
+        # After close the network carries on serially from the same state.
+        after = run(network, self.inputs[10:], rng, before[-1])
+        np.testing.assert_array_equal(np.concatenate([before, after]), expected)
+        np.testing.assert_array_equal(network.population.plasticity.post_trace, serial.population.plasticity.post_trace)
+        np.testing.assert_array_equal(network.population._recurrent_history.to_array(),
+                                      serial.population._recurrent_history.to_array())
+
+    def test_killed_worker_raises(self):
+        network = ParallelNeuralNetwork(20, 5, NEURON_TYPES, workers=2, timeout=2.0)
+        run(network, self.inputs[:3])
+        os.kill(network._processes[0].pid, signal.SIGKILL)
+        network._processes[0].join()
+        with self.assertRaisesRegex(RuntimeError, "workers died"):
+            network.forward(self.inputs[3])
+        with self.assertLogs("src.parallel", "WARNING"):
+            network.close()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ParallelNeuralNetwork(20, 5, NEURON_TYPES, backend="object")
+        with self.assertRaises(ValueError):
+            ParallelNeuralNetwork(20, 5, NEURON_TYPES, workers=0)
+        with self.assertRaises(ValueError):
+            ParallelNeuralNetwork(20, 5, NEURON_TYPES, delays=2)
+
+if __name__ == '__main__':
+    unittest.main()
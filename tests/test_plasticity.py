@@ -0,0 +1,146 @@
+import copy
+import unittest
+import numpy as np
+from src.connectivity import SparseConnectivity
+from src.network import NeuralNetwork
+from src.neuron import GeneralizedNeuron
+from src.plasticity import TraceSTDP
+
+def pairwise_delta(pre_times, post_times, stdp_window=20.0, A_plus=0.015, A_minus=0.012):
+    """Reference pairwise STDP kernel from GeneralizedNeuron.update_weights, each pair counted once."""
+    delta_w = 0.0
+    for pre_t in pre_times:
+        for post_t in post_times:
+            dt = post_t - pre_t
+            if dt > 0 and dt <= stdp_window:
+                delta_w += A_plus * np.exp(-dt / stdp_window)
+            elif dt < 0 and abs(dt) <= stdp_window:
+                delta_w -= A_minus * np.exp(dt / stdp_window)
+    return delta_w
+
+class TestTraceSTDP(unittest.TestCase):
+    """The trace rule equals the pairwise rule whenever all spikes fall inside one stdp_window."""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(5)
+        self.time_step = 0.5
+        self.num_steps = 40  # 20 ms, exactly one stdp_window
+        self.pre_raster = self.rng.random((self.num_steps, 6)) < 0.2
+        self.post_raster = self.rng.random((self.num_steps, 4)) < 0.2
+
+    def run_engine(self, stdp):
+        for step in range(self.num_steps):
+            stdp.step(step * self.time_step, self.pre_raster[step], self.post_raster[step])
+
+    def expected_weights(self, initial):
+        expected = initial.copy()
+        times = np.arange(self.num_steps) * self.time_step
+        for i in range(initial.shape[0]):
+            for j in range(initial.shape[1]):
+                expected[i, j] += pairwise_delta(times[self.pre_raster[:, j]], times[self.post_raster[:, i]])
+        return expected
+
+    def test_dense_matches_pairwise_rule(self):
+        weights = np.zeros((4, 6))
+        self.run_engine(TraceSTDP(weights))
+        np.testing.assert_allclose(weights, self.expected_weights(np.zeros((4, 6))), atol=1e-12)
+
+    def test_sparse_matches_dense(self):
+        dense = self.rng.random((4, 6)) * (self.rng.random((4, 6)) < 0.6)
+        sparse = SparseConnectivity.from_dense(dense)
+        self.run_engine(TraceSTDP(dense, mask=dense != 0))
+        self.run_engine(TraceSTDP(sparse))
+        np.testing.assert_allclose(sparse.toarray(), dense, atol=1e-12)
+
+    def test_clipping(self):
+        weights = np.full((4, 6), 0.59)
+        stdp = TraceSTDP(weights, A_plus=1.0, A_minus=1.0, min_weight=-0.6, max_weight=0.6)
+        self.run_engine(stdp)
+        self.assertTrue(np.all(np.abs(weights) <= 0.6))
+
+    def test_batched_matches_independent_rules(self):
+        # Trial 0 replays the class rasters; the others see shuffled spikes and clip at the bounds.
+        pre = np.stack([self.pre_raster, self.rng.permutation(self.pre_raster), self.pre_raster[::-1]], axis=1)
+        post = np.stack([self.post_raster, self.rng.permutation(self.post_raster), self.post_raster[::-1]], axis=1)
+        dense = self.rng.random((4, 6)) * (self.rng.random((4, 6)) < 0.6)
+        options = {"A_plus": 0.2, "A_minus": 0.2, "min_weight": 0.0, "max_weight": 1.0}
+        for weights, mask in ((dense, dense != 0), (SparseConnectivity.from_dense(dense), None)):
+            template = TraceSTDP(weights, mask=mask, **options)
+            singles = [TraceSTDP(copy.deepcopy(weights), mask=mask, **options) for _ in range(3)]
+            batch = template.batched(3)
+            for step in range(self.num_steps):
+                batch.step(step * self.time_step, pre[step], post[step])
+                for trial, single in enumerate(singles):
+                    single.step(step * self.time_step, pre[step, trial], post[step, trial])
+            for trial, single in enumerate(singles):
+                if mask is None:
+                    np.testing.assert_array_equal(batch.weights.data[trial], single.weights.data)
+                else:
+                    np.testing.assert_array_equal(batch.weights[trial], single.weights)
+                np.testing.assert_array_equal(batch.pre_trace[trial], single.pre_trace)
+                np.testing.assert_array_equal(batch.post_time[trial], single.post_time)
+            self.assertFalse(np.any(template.pre_trace), "The template rule should be left untouched")
+
+class TestNeuronTracePlasticity(unittest.TestCase):
+    def test_single_post_spike_matches_update_weights(self):
+        pairwise = GeneralizedNeuron(3, "generic", "cortex", time_step=0.1)
+        trace = GeneralizedNeuron(3, "generic", "cortex", time_step=0.1, plasticity="trace")
+        inputs = [np.array([1.0, 0.0, 0.9]), np.array([0.0, 1.0, 0.0]), np.array([1.0, 1.0, 0.0])] * 4
+        for neuron in (pairwise, trace):
+            neuron.weights = np.zeros(3)
+            for step, x in enumerate(inputs):
+                if step == len(inputs) - 1:
+                    neuron.membrane_potential = neuron.threshold  # Force one postsynaptic spike
+                neuron.forward(x)
+        self.assertEqual(trace.spike, 1)
+        self.assertTrue(np.any(pairwise.weights != 0))
+        np.testing.assert_allclose(trace.weights, pairwise.weights, atol=1e-12)
+
+    def test_multi_spike_matches_update_weights(self):
+        # Presynaptic spikes fall only between two postsynaptic spikes, so the pairwise rule counts
+        # every pair once, at the second postsynaptic spike: depression against the first and
+        # potentiation towards the second.
+        rng = np.random.default_rng(4)
+        inputs = np.zeros((36, 3))
+        inputs[6:35] = rng.random((29, 3)) < 0.3
+        post_steps = (5, 35)
+        pairwise = GeneralizedNeuron(3, "generic", "cortex", time_step=0.1)
+        trace = GeneralizedNeuron(3, "generic", "cortex", time_step=0.1, plasticity="trace")
+        for neuron in (pairwise, trace):
+            neuron.weights = np.zeros(3)
+            spikes = []
+            for step, x in enumerate(inputs):
+                if step in post_steps:
+                    neuron.membrane_potential = neuron.threshold
+                neuron.forward(x)
+                spikes.append(neuron.spike)
+            self.assertEqual(np.flatnonzero(spikes).tolist(), list(post_steps))
+        times = np.arange(len(inputs)) * 0.1
+        expected = [pairwise_delta(times[inputs[:, j] > 0.5], times[list(post_steps)]) for j in range(3)]
+        np.testing.assert_allclose(pairwise.weights, expected, atol=1e-12)
+        np.testing.assert_allclose(trace.weights, pairwise.weights, atol=1e-12)
+
+    def test_unknown_plasticity(self):
+        with self.assertRaises(ValueError):
+            GeneralizedNeuron(3, plasticity="hebbian")
+
+class TestNetworkPlasticity(unittest.TestCase):
+    def test_only_existing_synapses_change(self):
+        neuron_types = ["sensory", "pyramidal", "sensory", "interneuron", "sensory"] * 2
+        network = NeuralNetwork(10, 5, neuron_types=neuron_types, backend="numpy", plasticity="trace")
+        initial = network.recurrent_connectivity.copy()
+        rng = np.random.default_rng(2)
+        outputs = np.zeros(10)
+        for t in range(40):
+            inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal(5) * 100.0
+            outputs = network.forward(inputs, outputs)
+        changed = network.recurrent_connectivity != initial
+        self.assertTrue(changed.any())
+        self.assertFalse(np.any(changed & (initial == 0)), "Absent synapses should stay absent")
+
+    def test_plasticity_requires_array_backend(self):
+        with self.assertRaises(ValueError):
+            NeuralNetwork(10, 5, plasticity="trace")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from src.network import NeuralNetwork
+
+class TestNeuronPopulation(unittest.TestCase):
+    def run_pair(self, neuron_types=None, num_neurons=10, time_steps=40, noise=100.0):
+        reference = NeuralNetwork(num_neurons, 5, neuron_types=neuron_types, backend="object")
+        vectorized = NeuralNetwork(num_neurons, 5, neuron_types=neuron_types, backend="numpy")
+        rng = np.random.default_rng(7)
+        ref_outputs = np.zeros(num_neurons)
+        vec_outputs = np.zeros(num_neurons)
+        for t in range(time_steps):
+            inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal(5) * noise
+            ref_outputs = reference.forward(inputs, ref_outputs)
+            vec_outputs = vectorized.forward(inputs, vec_outputs)
+            np.testing.assert_array_equal(vec_outputs, ref_outputs, err_msg=f"step {t}")
+        return reference, vectorized
+
+    def test_default_network_matches_object_path(self):
+        reference, vectorized = self.run_pair()
+        for ref_state, vec_state in zip(reference.get_state(), vectorized.get_state()):
+            for key in ("membrane_potential", "threshold", "refractory_time", "burst_count", "is_excitatory"):
+                self.assertEqual(ref_state[key], vec_state[key])
+            self.assertAlmostEqual(ref_state["adaptation_current"], vec_state["adaptation_current"])
+
+    def test_mixed_types_match_object_path(self):
+        neuron_types = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                        "sensory", "granule", "generic", "interneuron", "pyramidal"]
+        reference, vectorized = self.run_pair(neuron_types=neuron_types, noise=0.5)
+        ref_thresholds = [state["threshold"] for state in reference.get_state()]
+        vec_thresholds = [state["threshold"] for state in vectorized.get_state()]
+        self.assertEqual(ref_thresholds, vec_thresholds)
+
+    def test_state_keys(self):
+        object_state = NeuralNetwork(10, 5, backend="object").get_state()[0]
+        array_state = NeuralNetwork(10, 5, backend="numpy").get_state()[0]
+        self.assertEqual(set(array_state), set(object_state) - {"weights", "bias"})
+        materialized = NeuralNetwork(10, 5, backend="numpy", materialize_neurons=True).get_state()[0]
+        self.assertEqual(set(materialized), set(object_state))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            NeuralNetwork(10, 5, backend="fortran")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from src.network import NeuralNetwork
+from src.realtime import FakeSensor, RealtimeRunner, sleep_until
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"]
+
+def filled_queue(values):
+    queue = asyncio.Queue()
+    for value in values:
+        queue.put_nowait(value)
+    queue.put_nowait(None)
+    return queue
+
+async def drain(queue):
+    items = []
+    while (item := await queue.get()) is not None:
+        items.append(item)
+    return items
+
+class TestRealtimeRunner(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal((40, 5)) * 100.0
+
+    def test_block_matches_forward(self):
+        expected = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy").simulate_network(
+            self.inputs, stream=True)
+        expected = [outputs for _, outputs in expected]
+
+        async def main():
+            runner = RealtimeRunner(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"), filled_queue(self.inputs),
+                                    rate=20000.0, buffer_size=4, overflow="block")
+            received = asyncio.create_task(drain(runner.subscribe(maxsize=100)))
+            stats = await runner.run()
+            return stats, await received
+
+        stats, received = asyncio.run(main())
+        self.assertEqual(stats.steps, 40)
+        self.assertEqual(stats.dropped_inputs, 0)
+        self.assertEqual(stats.step_times.sum(), 40)
+        self.assertEqual([step for step, _ in received], list(range(40)))
+        np.testing.assert_array_equal([outputs for _, outputs in received], expected)
+
+    def test_drops_oldest_inputs_and_outputs(self):
+        async def main():
+            runner = RealtimeRunner(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"), filled_queue(self.inputs),
+                                    rate=20000.0, buffer_size=4)
+            slow = runner.subscribe(maxsize=2)
+            stats = await runner.run()
+            return stats, await drain(slow)
+
+        stats, received = asyncio.run(main())
+        self.assertEqual(stats.dropped_inputs, 36)
+        self.assertEqual(stats.steps, 4)
+        self.assertEqual(stats.dropped_outputs, 3)
+        self.assertEqual([step for step, _ in received], [3])
+
+    def test_late_inputs_and_steps(self):
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy")
+
+        async def main():
+            runner = RealtimeRunner(network, FakeSensor(self.inputs, rate=100.0), rate=1000.0)
+            return await runner.run(steps=20)
+
+        stats = asyncio.run(main())
+        self.assertEqual(stats.steps, 20)
+        self.assertGreater(stats.late_inputs, 10)
+
+        forward = network.forward
+
+        def slow_forward(inputs, previous_outputs):
+            time.sleep(0.003)
+            return forward(inputs, previous_outputs)
+
+        network.forward = slow_forward
+
+        async def overrun():
+            runner = RealtimeRunner(network, FakeSensor(self.inputs, rate=1000.0), rate=1000.0)
+            return await runner.run(steps=10)
+
+        stats = asyncio.run(overrun())
+        self.assertEqual(stats.steps, 10)
+        self.assertGreater(stats.late_steps, 0)
+        self.assertEqual(stats.step_times[stats.bin_edges[:-1] >= 2e-3].sum(), 10)
+        self.assertEqual(stats.as_dict()["steps"], 10)
+
+    def test_stop_from_subscriber(self):
+        async def main():
+            runner = RealtimeRunner(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"),
+                                    FakeSensor(self.inputs, rate=2000.0), rate=2000.0)
+            outputs = runner.subscribe()
+
+            async def stop_after(count):
+                for _ in range(count):
+                    await outputs.get()
+                runner.stop()
+
+            stopper = asyncio.create_task(stop_after(5))
+            stats = await runner.run()
+            await stopper
+            return stats
+
+        self.assertLessEqual(asyncio.run(main()).steps, 6)
+
+    def test_source_error_is_raised(self):
+        async def failing_sensor():
+            for x in self.inputs[:5]:
+                yield x
+            raise RuntimeError("sensor disconnected")
+
+        async def main():
+            runner = RealtimeRunner(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"), failing_sensor(),
+                                    rate=20000.0, overflow="block")
+            received = asyncio.create_task(drain(runner.subscribe(maxsize=100)))
+            with self.assertRaisesRegex(RuntimeError, "sensor disconnected"):
+                await runner.run()
+            return runner.stats, await received
+
+        stats, received = asyncio.run(main())
+        self.assertEqual(stats.steps - stats.late_inputs, 5)
+        self.assertEqual(len(received), stats.steps)
+
+    def test_invalid_arguments(self):
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy")
+        with self.assertRaises(ValueError):
+            RealtimeRunner(network, FakeSensor(self.inputs), overflow="latest")
+        with self.assertRaises(ValueError):
+            RealtimeRunner(network, FakeSensor(self.inputs), rate=0)
+        with self.assertRaises(ValueError):
+            RealtimeRunner(network, FakeSensor(self.inputs), spin_time=-1e-3)
+
+    def test_spin_time(self):
+        sleep, delays = asyncio.sleep, []
+
+        async def recording_sleep(delay):
+            delays.append(delay)
+            await sleep(delay)
+
+        with mock.patch("asyncio.sleep", recording_sleep):
+            asyncio.run(sleep_until(time.perf_counter() + 5e-3))
+            self.assertLess(delays[0], 4.5e-3)
+            self.assertIn(0, delays[1:])
+            delays.clear()
+            asyncio.run(sleep_until(time.perf_counter() + 5e-3, spin_time=0))
+            self.assertEqual(len(delays), 1)
+            self.assertGreater(delays[0], 4e-3)
+
+        async def main():
+            runner = RealtimeRunner(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"), filled_queue(self.inputs),
+                                    rate=2000.0, overflow="block", spin_time=0)
+            return await runner.run()
+
+        self.assertEqual(asyncio.run(main()).steps, 40)
+
+if __name__ == '__main__':
+    unittest.main()
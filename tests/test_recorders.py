@@ -0,0 +1,180 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.network import NeuralNetwork
+from src.recorders import (ChunkedBuffer, EventFileSink, PotentialRecorder, Recorder, SpikeEventRecorder,
+                           SpikeEvents, SpikeRecorder, WeightRecorder)
+
+NEURON_TYPES = ["pyramidal", "interneuron", "sensory", "purkinje", "motor",
+                "sensory", "granule", "generic", "interneuron", "pyramidal"]
+
+class TestChunkedBuffer(unittest.TestCase):
+    def test_preallocated(self):
+        buffer = ChunkedBuffer((3,), capacity=5)
+        for i in range(5):
+            buffer.append(np.full(3, i))
+        self.assertEqual(len(buffer.chunks), 1)
+        np.testing.assert_array_equal(buffer.to_array()[:, 0], np.arange(5))
+
+    def test_chunked(self):
+        buffer = ChunkedBuffer((2,), chunk_size=4)
+        for i in range(10):
+            buffer.append([i, -i])
+        self.assertEqual(len(buffer), 10)
+        self.assertEqual(len(buffer.chunks), 2)
+        np.testing.assert_array_equal(buffer.to_array()[:, 0], np.arange(10))
+
+    def test_sink_keeps_memory_bounded(self):
+        received = []
+        buffer = ChunkedBuffer((), int, chunk_size=4, sink=lambda first, chunk: received.append((first, chunk.copy())))
+        for i in range(10):
+            buffer.append(i)
+        buffer.flush()
+        self.assertEqual(buffer.chunks, [])
+        self.assertEqual([first for first, _ in received], [0, 4, 8])
+        np.testing.assert_array_equal(np.concatenate([chunk for _, chunk in received]), np.arange(10))
+
+    def test_extend(self):
+        buffer = ChunkedBuffer((), int, chunk_size=4)
+        for block in (np.arange(3), np.arange(3, 3), np.arange(3, 10)):
+            buffer.extend(block)
+        self.assertEqual(len(buffer.chunks), 2)
+        np.testing.assert_array_equal(buffer.to_array(), np.arange(10))
+
+class TestSimulateNetwork(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.inputs = np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal((30, 5)) * 100.0
+
+    def manual_run(self, network):
+        spikes, potentials = [], []
+        outputs = np.zeros(network.num_neurons)
+        for x in self.inputs:
+            outputs = network.forward(x, outputs)
+            spikes.append(outputs)
+            potentials.append(network.membrane_potentials().copy())
+        return np.array(spikes), np.array(potentials)
+
+    def test_recorders_match_manual_loop(self):
+        for backend in ("object", "numpy"):
+            expected_spikes, expected_potentials = self.manual_run(NeuralNetwork(10, 5, NEURON_TYPES, backend=backend))
+            network = NeuralNetwork(10, 5, NEURON_TYPES, backend=backend)
+            spikes = SpikeRecorder()
+            potentials = PotentialRecorder(neurons=[2, 5], every=3)
+            outputs = network.simulate_network(self.inputs, recorders=[spikes, potentials])
+            np.testing.assert_array_equal(outputs, expected_spikes[-1])
+            np.testing.assert_array_equal(spikes.result(), expected_spikes)
+            np.testing.assert_array_equal(potentials.result(), expected_potentials[::3][:, [2, 5]])
+            np.testing.assert_array_equal(potentials.sampled_steps(), np.arange(0, 30, 3))
+
+    def test_input_sources(self):
+        from_array = SpikeRecorder()
+        from_generator = SpikeRecorder()
+        from_callable = SpikeRecorder()
+        NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy").simulate_network(self.inputs, recorders=[from_array])
+        NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy").simulate_network(
+            (x for x in self.inputs), recorders=[from_generator]
+        )
+        NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy").simulate_network(
+            lambda t: self.inputs[t], steps=30, recorders=[from_callable]
+        )
+        np.testing.assert_array_equal(from_generator.result(), from_array.result())
+        np.testing.assert_array_equal(from_callable.result(), from_array.result())
+        with self.assertRaises(ValueError):
+            NeuralNetwork(10, 5, backend="numpy").simulate_network(lambda t: self.inputs[t])
+
+    def test_stream(self):
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy")
+        expected_spikes, _ = self.manual_run(NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy"))
+        run = network.simulate_network(iter(self.inputs), steps=10, stream=True)
+        steps = []
+        for step, outputs in run:
+            np.testing.assert_array_equal(outputs, expected_spikes[step])
+            steps.append(step)
+        self.assertEqual(steps, list(range(10)))
+
+    def test_weight_snapshots(self):
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy", plasticity="trace")
+        weights = WeightRecorder(every=10)
+        network.simulate_network(self.inputs, recorders=[weights])
+        snapshots = weights.result()
+        self.assertEqual(snapshots.shape, (3, 10, 10))
+        np.testing.assert_array_equal(snapshots[-1][snapshots[0] == 0], 0.0)
+
+    def test_incomplete_recorder_fails_on_creation(self):
+        class CountRecorder(Recorder):
+            def row_shape(self, network):
+                return ()
+
+        with self.assertRaises(TypeError):
+            CountRecorder()
+
+class TestSpikeEvents(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def run_network(self, recorders, steps=200):
+        # Potentials are reset to random values each step so that neurons actually fire.
+        network = NeuralNetwork(10, 5, NEURON_TYPES, backend="numpy")
+        rng = np.random.default_rng(6)
+
+        def inputs(t):
+            network.population.membrane_potential[:] = rng.uniform(-75.0, -40.0, 10)
+            return np.array([100.0, 50.0, -20.0, 80.0, 30.0]) + rng.standard_normal(5) * 100.0
+
+        network.simulate_network(inputs, steps, recorders=recorders)
+
+    def test_matches_dense_raster(self):
+        dense, events, subset = SpikeRecorder(), SpikeEventRecorder(chunk_size=16), SpikeEventRecorder(neurons=[1, 6])
+        self.run_network([dense, events, subset])
+        spikes = dense.result()
+        result = events.result()
+        self.assertGreater(len(result), 50)
+        self.assertEqual(result.num_steps, 200)
+        np.testing.assert_array_equal(result.raster(), np.sign(spikes))
+        np.testing.assert_array_equal(result.counts(), np.sum(spikes != 0, axis=0))
+        np.testing.assert_allclose(result.rates(), np.sum(spikes != 0, axis=0) / 0.1)
+        np.testing.assert_allclose(result.population_rate(50), np.sum(spikes != 0, axis=1).reshape(4, 50).sum(1) / 0.25)
+        self.assertEqual(set(subset.result().neurons), {1, 6})
+        np.testing.assert_array_equal(subset.result().counts()[[1, 6]], result.counts()[[1, 6]])
+
+        dense, events = SpikeRecorder(every=2), SpikeEventRecorder(every=2)
+        self.run_network([dense, events], steps=199)
+        spikes = dense.result()
+        result = events.result()
+        self.assertEqual((result.num_steps, result.num_sampled), (199, 100))
+        self.assertTrue(np.all(result.steps % 2 == 0))
+        np.testing.assert_array_equal(result.raster(), np.sign(spikes))
+        # 100 sampled steps of 0.5 ms; the last 49-step bin holds 25 of them.
+        np.testing.assert_allclose(result.rates(), np.sum(spikes != 0, axis=0) / 0.05)
+        per_bin = np.add.reduceat(np.sum(spikes != 0, axis=1), [0, 25, 50, 75])
+        np.testing.assert_allclose(result.population_rate(50), per_bin / 0.125)
+
+    def test_streams_to_file(self):
+        path = os.path.join(self.path, "spikes.bin")
+        in_memory, streamed = SpikeEventRecorder(), SpikeEventRecorder(chunk_size=8, sink=EventFileSink(path))
+        self.run_network([in_memory, streamed])
+        self.assertEqual(len(streamed.result()), 0)
+        loaded = SpikeEvents.from_file(path, 10, 200)
+        np.testing.assert_array_equal(loaded.events, in_memory.result().events)
+        self.assertEqual(len(SpikeEvents.from_file(EventFileSink(path).path, 10)), 0)
+
+    def test_file_metadata_sidecar(self):
+        path = os.path.join(self.path, "spikes.bin")
+        in_memory, streamed = SpikeEventRecorder(every=3), SpikeEventRecorder(every=3, sink=EventFileSink(path))
+        self.run_network([in_memory, streamed])
+        expected, loaded = in_memory.result(), SpikeEvents.from_file(path)
+        np.testing.assert_array_equal(loaded.events, expected.events)
+        self.assertEqual((loaded.num_neurons, loaded.num_steps, loaded.every), (10, 200, 3))
+        np.testing.assert_array_equal(loaded.raster(), expected.raster())
+        self.assertEqual(SpikeEvents.from_file(path, num_steps=150).num_steps, 150)
+        # A new sink drops the previous run's sidecar along with its events.
+        EventFileSink(path)
+        with self.assertRaises(ValueError):
+            SpikeEvents.from_file(path)
+
+if __name__ == '__main__':
+    unittest.main()